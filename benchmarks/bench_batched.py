@@ -0,0 +1,54 @@
+# Compares the sequential and batched transcribe_audio paths on CPU.
+# Each mode runs in its own subprocess so peak memory is measured independently.
+#
+# Usage: python benchmarks/bench_batched.py <audio_file> <model_path> [--batch-size 8] [--compute-type auto] [--cpu-threads 0]
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from benchmarks.peak_memory import peak_rss_mb, format_mb
+
+def run_once(args):
+    from utils.transcription_util import transcribe_audio
+    output_file = os.path.join(tempfile.mkdtemp(), "transcript.txt")
+    start_time = time.time()
+    info = transcribe_audio(args.audio_file, args.model_path, "cpu", output_file, compute_type=args.compute_type,
+                            cpu_threads=args.cpu_threads, batch_size=args.batch_size, use_cache=False, resume=False, emit=lambda event: None)
+    elapsed = time.time() - start_time
+    with open(output_file, 'r', encoding='utf-8') as f:
+        segment_count = sum(1 for _ in f)
+    print(json.dumps({"elapsed": elapsed, "duration": info.duration, "rtf": elapsed / info.duration,
+                      "peak_rss_mb": peak_rss_mb(), "segments": segment_count}))
+
+def run_mode(args, batch_size):
+    command = [sys.executable, os.path.abspath(__file__), args.audio_file, args.model_path, "--run",
+               "--batch-size", str(batch_size), "--compute-type", args.compute_type, "--cpu-threads", str(args.cpu_threads)]
+    result = subprocess.run(command, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sequential vs batched transcription on CPU")
+    parser.add_argument("audio_file")
+    parser.add_argument("model_path")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--compute-type", default="auto")
+    parser.add_argument("--cpu-threads", type=int, default=0)
+    parser.add_argument("--run", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run_once(args)
+        return
+
+    print(f"{'mode':<14}{'audio (s)':>10}{'wall (s)':>10}{'RTF':>8}{'peak RSS (MB)':>15}{'segments':>10}")
+    for label, batch_size in (("sequential", 0), (f"batched x{args.batch_size}", args.batch_size)):
+        result = run_mode(args, batch_size)
+        print(f"{label:<14}{result['duration']:>10.1f}{result['elapsed']:>10.1f}{result['rtf']:>8.3f}{format_mb(result['peak_rss_mb'], 15)}{result['segments']:>10}")
+
+if __name__ == "__main__":
+    main()
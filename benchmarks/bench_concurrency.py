@@ -0,0 +1,61 @@
+# Measures throughput and memory when several jobs share one model through the transcription service.
+# Each concurrency level runs in a fresh subprocess with num_workers equal to the number of jobs.
+#
+# Usage: python benchmarks/bench_concurrency.py <audio_file> <model_path> [--jobs 1,2,4,8] [--device auto]
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from benchmarks.peak_memory import peak_rss_mb, format_mb
+
+def run_once(args):
+    import config
+    config.SERVICE_NUM_WORKERS = args.run
+    from utils.transcription_util import transcribe_audio
+    from utils.model_pool import model_pool
+
+    output_dir = tempfile.mkdtemp()
+    durations = []
+
+    def job(index):
+        info = transcribe_audio(args.audio_file, args.model_path, args.device, os.path.join(output_dir, f"{index}.txt"),
+                                use_cache=False, resume=False, emit=lambda event: None)
+        durations.append(info.duration)
+
+    start_time = time.time()
+    threads = [threading.Thread(target=job, args=(i,)) for i in range(args.run)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.time() - start_time
+    print(json.dumps({"elapsed": elapsed, "audio": sum(durations), "loads": model_pool.stats()["loads"],
+                      "peak_rss_mb": peak_rss_mb()}))
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent jobs sharing one model")
+    parser.add_argument("audio_file")
+    parser.add_argument("model_path")
+    parser.add_argument("--jobs", default="1,2,4,8")
+    parser.add_argument("--device", default="auto")
+    parser.add_argument("--run", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run_once(args)
+        return
+
+    print(f"{'jobs':>6}{'wall (s)':>10}{'audio s / wall s':>18}{'model loads':>13}{'peak RSS (MB)':>15}")
+    for jobs in [int(n) for n in args.jobs.split(",")]:
+        command = [sys.executable, os.path.abspath(__file__), args.audio_file, args.model_path, "--run", str(jobs), "--device", args.device]
+        result = json.loads(subprocess.run(command, capture_output=True, text=True, check=True).stdout.strip().splitlines()[-1])
+        print(f"{jobs:>6}{result['elapsed']:>10.1f}{result['audio'] / result['elapsed']:>18.1f}{result['loads']:>13}{format_mb(result['peak_rss_mb'], 15)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# Measures how multi-process CPU transcription scales with the number of processes.
+# Each run uses a fresh subprocess so model loading and process pools do not leak between runs.
+#
+# Usage: python benchmarks/bench_parallel.py <audio_file> <model_path> [--processes 1,2,4,8] [--compute-type auto]
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+def run_once(args):
+    from utils.transcription_util import transcribe_audio
+    output_file = os.path.join(tempfile.mkdtemp(), "transcript.txt")
+    # A single process gets every core; parallel runs split the cores between processes
+    cpu_threads = os.cpu_count() if args.run == 1 else 0
+    start_time = time.time()
+    info = transcribe_audio(args.audio_file, args.model_path, "cpu", output_file, compute_type=args.compute_type,
+                            cpu_threads=cpu_threads, num_processes=args.run, use_cache=False, resume=False, emit=lambda event: None)
+    elapsed = time.time() - start_time
+    print(json.dumps({"elapsed": elapsed, "duration": info.duration}))
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark multi-process CPU transcription scaling")
+    parser.add_argument("audio_file")
+    parser.add_argument("model_path")
+    parser.add_argument("--processes", default=None, help="comma separated process counts (default: powers of two up to the CPU count)")
+    parser.add_argument("--compute-type", default="auto")
+    parser.add_argument("--run", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run_once(args)
+        return
+
+    if args.processes:
+        counts = [int(n) for n in args.processes.split(",")]
+    else:
+        counts = [1]
+        while counts[-1] * 2 <= (os.cpu_count() or 1):
+            counts.append(counts[-1] * 2)
+
+    print(f"{'processes':>10}{'wall (s)':>10}{'RTF':>8}{'speedup':>9}{'efficiency':>12}")
+    baseline = None
+    for count in counts:
+        command = [sys.executable, os.path.abspath(__file__), args.audio_file, args.model_path,
+                   "--run", str(count), "--compute-type", args.compute_type]
+        result = json.loads(subprocess.run(command, capture_output=True, text=True, check=True).stdout.strip().splitlines()[-1])
+        baseline = baseline or result["elapsed"]
+        speedup = baseline / result["elapsed"]
+        print(f"{count:>10}{result['elapsed']:>10.1f}{result['elapsed'] / result['duration']:>8.3f}{speedup:>9.2f}{speedup / count:>12.0%}")
+
+if __name__ == "__main__":
+    main()
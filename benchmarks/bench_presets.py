@@ -0,0 +1,60 @@
+# Measures real-time factor and word error rate of each decoding preset against reference transcripts.
+# References can be plain text or transcripts in the "[start -> end] text" format (such as robf.txt).
+#
+# Usage: python benchmarks/bench_presets.py <model_path> <audio_file>:<reference_file> [<audio_file>:<reference_file> ...]
+#        [--presets fast,balanced,accurate] [--device auto]
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from utils.presets import PRESETS
+from utils.transcription_util import transcribe_audio
+
+def transcript_words(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    text = re.sub(r"\[[\d.]+s -> [\d.]+s\]", " ", text)
+    return re.sub(r"[^\w\s']", " ", text.lower()).split()
+
+def word_error_rate(reference, hypothesis):
+    # Word-level Levenshtein distance divided by the reference length
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_word in enumerate(reference, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hypothesis, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ref_word != hyp_word)))
+        previous = current
+    return previous[-1] / max(len(reference), 1)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark decoding presets for speed and accuracy")
+    parser.add_argument("model_path")
+    parser.add_argument("pairs", nargs="+", help="audio_file:reference_file")
+    parser.add_argument("--presets", default=",".join(PRESETS))
+    parser.add_argument("--device", default="auto")
+    args = parser.parse_args()
+
+    output_dir = tempfile.mkdtemp()
+    print(f"{'preset':<10}{'audio (s)':>10}{'wall (s)':>10}{'RTF':>8}{'WER':>8}")
+    for preset in args.presets.split(","):
+        total_audio = total_wall = total_errors = total_words = 0.0
+        for pair in args.pairs:
+            audio_file, reference_file = pair.rsplit(":", 1)
+            output_file = os.path.join(output_dir, f"{preset}.txt")
+            start_time = time.time()
+            info = transcribe_audio(audio_file, args.model_path, args.device, output_file, preset=preset,
+                                    use_cache=False, resume=False, emit=lambda event: None)
+            total_wall += time.time() - start_time
+            total_audio += info.duration
+            reference = transcript_words(reference_file)
+            total_errors += word_error_rate(reference, transcript_words(output_file)) * len(reference)
+            total_words += len(reference)
+        print(f"{preset:<10}{total_audio:>10.1f}{total_wall:>10.1f}{total_wall / total_audio:>8.3f}{total_errors / max(total_words, 1):>8.1%}")
+
+if __name__ == "__main__":
+    main()
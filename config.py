@@ -1,6 +1,87 @@
 import logging
+import os
+import socket
+import tempfile
 ##Default model path
 DEFAULT_MODEL_PATH = r"C:\Users\rober\.cache\huggingface\hub\models--Systran--faster-whisper-large-v3\snapshots\edaa852ec7e145841d8ffdb056a99866b5f0a478"
+##Model pool: how many loaded models to keep warm and how much memory they may use
+MODEL_POOL_MAX_MODELS = 2
+MODEL_POOL_MEMORY_BUDGET_MB = 8192
+##Concurrent transcriptions one shared model instance can run at once (CTranslate2 num_workers)
+SERVICE_NUM_WORKERS = 2
+##Directory for caches shared between runs
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "youtube-transcriber")
+##Models converted with convert_model.py; transcriptions pick a matching converted model automatically
+CONVERTED_MODEL_DIR = os.path.join(CACHE_DIR, "models")
+##Result of probing which devices and compute types CTranslate2 supports
+DEVICE_PROBE_CACHE = os.path.join(CACHE_DIR, "device_probe.json")
+##CPU only: number of processes to split a transcription across (1 disables it) and target chunk length in seconds
+CPU_PROCESSES = 1
+CPU_CHUNK_SECONDS = 300
+##Decoding preset used when none is chosen: fast, balanced or accurate (see utils/presets.py)
+DEFAULT_PRESET = "accurate"
+##Voice activity detection ahead of decoding: speech probability threshold, silence needed to split speech, padding kept around speech
+VAD_FILTER = True
+VAD_THRESHOLD = 0.5
+VAD_MIN_SILENCE_MS = 2000
+VAD_SPEECH_PAD_MS = 400
+##Repetition loops: how many repeats count as a loop, n-gram size for loops inside one line, and how a looping window is re-decoded
+REPETITION_GUARD = True
+REPETITION_MAX_REPEATS = 3
+REPETITION_NGRAM_SIZE = 3
+REPETITION_REDECODE_SECONDS = 30
+REPETITION_REDECODE_TEMPERATURE = (0.2, 0.4, 0.6, 0.8, 1.0)
+##Two-pass mode: a small draft model transcribes everything and segments outside these limits are re-decoded with the main model (None disables it)
+DRAFT_MODEL_PATH = None
+TWO_PASS_MIN_AVG_LOGPROB = -0.6
+TWO_PASS_MAX_COMPRESSION_RATIO = 2.2
+TWO_PASS_MAX_NO_SPEECH_PROB = 0.5
+##How often (seconds of wall time) a running transcription checkpoints its progress so it can resume after a crash
+CHECKPOINT_INTERVAL_SECONDS = 30
+CHECKPOINT_FSYNC = True
+##Transcript writes are buffered until any of these is reached; progress events are sent at most this many times per second
+SINK_FLUSH_SECONDS = 5
+SINK_FLUSH_BYTES = 64 * 1024
+SINK_FLUSH_SEGMENTS = 100
+PROGRESS_MAX_RATE_HZ = 10
+##Decoded 16 kHz mono float32 audio, stored as memory-mappable .npy files so each file is only decoded once;
+##least recently used files are removed above the size limit (an hour of audio is about 230 MB)
+PCM_CACHE = True
+PCM_CACHE_DIR = os.path.join(CACHE_DIR, "pcm")
+PCM_CACHE_MAX_MB = 2000
+##Finished transcripts keyed on the decoded audio and decode settings
+TRANSCRIPT_CACHE = True
+TRANSCRIPT_CACHE_DIR = os.path.join(CACHE_DIR, "transcripts")
+TRANSCRIPT_CACHE_MAX_MB = 500
+##Downloaded audio keyed by YouTube video ID, least recently used files are removed above the size limit
+AUDIO_CACHE = True
+AUDIO_CACHE_DIR = os.path.join(CACHE_DIR, "audio")
+AUDIO_CACHE_MAX_MB = 5000
+##Video metadata from yt-dlp probes (no download) is reused for this long; caption URLs in it expire after a few hours
+PROBE_CACHE_FILE = os.path.join(CACHE_DIR, "probes.json")
+PROBE_CACHE_TTL_SECONDS = 6 * 3600
+##Caption fast path: "manual" uses uploader subtitles, "auto" also accepts YouTube's automatic captions, "off" always transcribes.
+##Captions replace the Whisper transcript entirely, so this is opt-in; the GUI chooses per job
+CAPTION_POLICY = "off"
+CAPTION_LANGUAGES = ["en", "en-US", "en-GB"]
+##Every download runs in its own scratch directory here (same filesystem as the caches, so moving results in is atomic)
+JOB_SCRATCH_DIR = os.path.join(CACHE_DIR, "jobs")
+##Streaming mode: seconds of downloaded audio to collect before transcribing a block
+STREAM_BLOCK_SECONDS = 30
+##Live mode: the transcript trails live audio by at most LIVE_MAX_LAG_SECONDS; audio is re-decoded in a sliding window
+##of up to LIVE_WINDOW_SECONDS every LIVE_STEP_SECONDS. When decoding falls behind, beam search is dropped first and
+##then the smaller fallback models are used, in order
+LIVE_MAX_LAG_SECONDS = 5
+LIVE_WINDOW_SECONDS = 30
+LIVE_STEP_SECONDS = 1.0
+LIVE_HOLDBACK_SECONDS = 1.0
+LIVE_FALLBACK_MODELS = ["base.en", "tiny.en"]
+##Where the long-lived transcription server listens: a Unix socket where the platform has them, otherwise
+##TCP on localhost (Windows)
+SERVER_SOCKET_PATH = os.path.join(tempfile.gettempdir(), "youtube-transcriber.sock")
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 47321
+SERVER_ADDRESS = SERVER_SOCKET_PATH if hasattr(socket, "AF_UNIX") else (SERVER_HOST, SERVER_PORT)
 ##Set up logging
 logging.basicConfig(filename='app.log', level=logging.DEBUG,
 format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
\ No newline at end of file
@@ -0,0 +1,48 @@
+import argparse
+import time
+from faster_whisper import WhisperModel
+from config import DEFAULT_MODEL_PATH
+from utils.audio_util import load_audio
+from utils.device_util import resolve_device
+from utils.model_convert import QUANTIZATIONS, convert_model
+from utils.model_pool import estimate_model_size
+
+def measure_rtf(model_path, device, compute_type, audio):
+    model = WhisperModel(model_path, device=device, compute_type=compute_type)
+    start_time = time.time()
+    segments, info = model.transcribe(audio, beam_size=5, language="en")
+    for _ in segments:
+        pass
+    return (time.time() - start_time) / info.duration
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert a Whisper checkpoint to a quantized CTranslate2 model for faster-whisper")
+    parser.add_argument("source", help="Transformers Whisper checkpoint, e.g. openai/whisper-large-v3 or a local directory")
+    parser.add_argument("--quantization", default="int8", choices=QUANTIZATIONS)
+    parser.add_argument("--alias", default=DEFAULT_MODEL_PATH,
+                        help="model path this conversion stands in for (default: config.DEFAULT_MODEL_PATH)")
+    parser.add_argument("--benchmark-audio", help="audio file used to compare the speed of the original and converted models")
+    parser.add_argument("--device", default="auto")
+    args = parser.parse_args()
+
+    output_dir = convert_model(args.source, args.quantization, args.alias)
+    print(f"Converted model written to {output_dir}")
+
+    original = args.alias or args.source
+    original_size = estimate_model_size(original)
+    converted_size = estimate_model_size(output_dir)
+    if original_size:
+        print(f"Size: {original_size / 2**20:.0f} MB -> {converted_size / 2**20:.0f} MB ({converted_size / original_size:.0%})")
+    else:
+        print(f"Size: {converted_size / 2**20:.0f} MB")
+
+    if args.benchmark_audio:
+        device, compute_type = resolve_device(args.device, "auto")
+        audio = load_audio(args.benchmark_audio)
+        original_rtf = measure_rtf(original, device, "default", audio)
+        converted_rtf = measure_rtf(output_dir, device, compute_type, audio)
+        print(f"RTF on {device}: {original_rtf:.3f} (original) -> {converted_rtf:.3f} ({args.quantization}, {compute_type}), "
+              f"{original_rtf / converted_rtf:.2f}x faster")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -15,7 +15,7 @@ def video_to_audio(video_URL, destination, final_filename):
   output = audio.download(output_path = destination)
 
   _, ext = os.path.splitext(output)
-  new_file = final_filename + '.mp3'
+  new_file = final_filename + ext
 
   # Change the name of the file
   os.rename(output, new_file)
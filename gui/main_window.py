@@ -1,15 +1,24 @@
 import sys
 import json
+import logging
 import os
-from PyQt6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QTextEdit, QProgressBar, QComboBox, QLabel, QFileDialog, QMessageBox, QApplication
+from PyQt6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QTextEdit, QProgressBar, QComboBox, QLabel, QFileDialog, QMessageBox, QApplication, QCheckBox
 from PyQt6.QtCore import QProcess, QTimer
-from utils.youtube_utils import download_or_use_existing_audio
-from config import DEFAULT_MODEL_PATH
+from PyQt6.QtNetwork import QLocalSocket, QTcpSocket
+from utils.youtube_utils import get_video_info, parse_time, range_suffix
+from utils.server_client import server_available, shutdown_server
+from utils.transcript_source import describe_transcript_source
+from utils.presets import PRESETS
+from config import DEFAULT_MODEL_PATH, SERVER_ADDRESS, DEFAULT_PRESET, CAPTION_POLICY
 
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.process = None
+        self.server_socket = None
+        self.server_pid = None
+        self.server_poll = None
+        self.preload_socket = None
         self.initUI()
 
     def initUI(self):
@@ -25,6 +34,18 @@ class MainWindow(QMainWindow):
         url_layout.addWidget(self.url_input)
         layout.addLayout(url_layout)
 
+        # Optional time range, only this part of the video is downloaded and transcribed
+        range_layout = QHBoxLayout()
+        range_layout.addWidget(QLabel("From:"))
+        self.start_input = QLineEdit()
+        self.start_input.setPlaceholderText("start (e.g. 40:00)")
+        range_layout.addWidget(self.start_input)
+        range_layout.addWidget(QLabel("To:"))
+        self.end_input = QLineEdit()
+        self.end_input.setPlaceholderText("end (e.g. 55:00)")
+        range_layout.addWidget(self.end_input)
+        layout.addLayout(range_layout)
+
         # Local model selection
         model_layout = QHBoxLayout()
         self.model_input = QLineEdit(DEFAULT_MODEL_PATH)
@@ -38,8 +59,21 @@ class MainWindow(QMainWindow):
         device_layout = QHBoxLayout()
         device_layout.addWidget(QLabel("Device:"))
         self.device_combo = QComboBox()
-        self.device_combo.addItems(["cuda", "cpu"])
+        self.device_combo.addItems(["auto", "cuda", "cpu"])
         device_layout.addWidget(self.device_combo)
+        device_layout.addWidget(QLabel("Preset:"))
+        self.preset_combo = QComboBox()
+        self.preset_combo.addItems(list(PRESETS))
+        self.preset_combo.setCurrentText(DEFAULT_PRESET)
+        device_layout.addWidget(self.preset_combo)
+        # Whether the video's own captions may be used instead of transcribing it
+        device_layout.addWidget(QLabel("Captions:"))
+        self.caption_combo = QComboBox()
+        self.caption_combo.addItems(["off", "manual", "auto"])
+        self.caption_combo.setCurrentText(CAPTION_POLICY)
+        device_layout.addWidget(self.caption_combo)
+        self.stream_checkbox = QCheckBox("Stream while downloading")
+        device_layout.addWidget(self.stream_checkbox)
         layout.addLayout(device_layout)
 
         # API Key input
@@ -59,6 +93,10 @@ class MainWindow(QMainWindow):
         self.progress_bar = QProgressBar()
         layout.addWidget(self.progress_bar)
 
+        # Model preload status
+        self.model_status = QLabel("Model not loaded")
+        layout.addWidget(self.model_status)
+
         # Output display
         self.log_text = QTextEdit()
         self.log_text.setReadOnly(True)
@@ -73,6 +111,73 @@ class MainWindow(QMainWindow):
         model_path = file_dialog.getExistingDirectory(self, "Select Model Directory")
         if model_path:
             self.model_input.setText(model_path)
+            self.start_preload()
+
+    def start_preload(self):
+        # Load the model in the background as soon as the window is up, so the first job does not wait for it.
+        # The model lives in the transcription server, which is started here if it is not already running.
+        self.progress_bar.setRange(0, 0)
+        if server_available():
+            self.send_preload()
+            return
+        if self.server_poll and self.server_poll.isActive():
+            return
+        self.model_status.setText("Starting transcription server...")
+        # Detached, so closing the window does not kill jobs the server is still running
+        script_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'transcription_server.py')
+        started, self.server_pid = QProcess.startDetached(sys.executable, [script_path])
+        if not started:
+            self.server_pid = None
+            self.server_failed()
+            return
+        self.server_poll_attempts = 0
+        self.server_poll = QTimer(self)
+        self.server_poll.timeout.connect(self.check_server_started)
+        self.server_poll.start(250)
+
+    def check_server_started(self):
+        self.server_poll_attempts += 1
+        if server_available():
+            self.server_poll.stop()
+            self.send_preload()
+        elif self.server_poll_attempts >= 120:
+            self.server_poll.stop()
+            self.server_failed()
+
+    def server_failed(self):
+        self.progress_bar.setRange(0, 100)
+        self.model_status.setText("Transcription server did not start, jobs will load the model themselves")
+
+    def connect_to_server(self):
+        # The server listens on a Unix socket, or on TCP localhost where there are none (Windows)
+        if isinstance(SERVER_ADDRESS, tuple):
+            server_socket = QTcpSocket(self)
+            server_socket.connectToHost(*SERVER_ADDRESS)
+        else:
+            server_socket = QLocalSocket(self)
+            server_socket.connectToServer(SERVER_ADDRESS)
+        return server_socket
+
+    def send_preload(self):
+        self.preload_socket = self.connect_to_server()
+        self.preload_socket.readyRead.connect(self.handle_preload_output)
+        if not self.preload_socket.waitForConnected(1000):
+            self.progress_bar.setRange(0, 100)
+            self.model_status.setText("Could not reach transcription server, jobs will load the model themselves")
+            return
+        request = {"command": "preload", "model_path": self.model_input.text(), "device": self.device_combo.currentText()}
+        self.preload_socket.write((json.dumps(request) + "\n").encode('utf-8'))
+
+    def handle_preload_output(self):
+        while self.preload_socket.canReadLine():
+            event = json.loads(self.preload_socket.readLine().data().decode())
+            if event['status'] == 'error':
+                self.model_status.setText(event['message'])
+                self.progress_bar.setRange(0, 100)
+            else:
+                self.model_status.setText(event['status'])
+                if event.get('model_loaded'):
+                    self.progress_bar.setRange(0, 100)
 
     def start_process(self):
         url = self.url_input.text()
@@ -90,38 +195,64 @@ class MainWindow(QMainWindow):
             self.log("Please enter a valid Claude API Key.")
             return
 
+        try:
+            start = parse_time(self.start_input.text())
+            end = parse_time(self.end_input.text())
+        except ValueError:
+            self.log("Please enter the time range as seconds, mm:ss or hh:mm:ss.")
+            return
+        if start is not None and end is not None and end <= start:
+            self.log("The end of the time range must be after its start.")
+            return
+
+        self.progress_bar.setRange(0, 100)
         self.progress_bar.setValue(0)
         self.log_text.clear()
+        self.statusBar().clearMessage()
 
-        self.log("Downloading audio...")
+        # Only the metadata is fetched here; the job itself uses captions when they are good enough and downloads otherwise
+        self.log("Fetching video metadata...")
         try:
-            self.log("Files before download:")
-            for file in os.listdir():
-                self.log(file)
-
-            audio_file, safe_title = download_or_use_existing_audio(url)
-            self.log(f"Audio downloaded: {audio_file}")
-            
-            self.log("Files after download:")
-            for file in os.listdir():
-                self.log(file)
-            
-            # Verify that the file exists
-            if not os.path.exists(audio_file):
-                raise FileNotFoundError(f"Audio file not found: {audio_file}")
-            else:
-                self.log(f"Verified: Audio file exists at {os.path.abspath(audio_file)}")
-            
+            safe_title, duration = get_video_info(url)
         except Exception as e:
-            self.log(f"Error in download_or_use_existing_audio: {str(e)}")
+            self.log(f"Error in get_video_info: {str(e)}")
             # Print the full traceback for debugging
             import traceback
             self.log(traceback.format_exc())
             return
+        safe_title += range_suffix(start, end)
+        self.log(f"Video: {safe_title} ({duration or 0:.0f} seconds)")
 
         output_file = os.path.abspath(f"{safe_title}.txt")
         self.log(f"Output file will be: {output_file}")
 
+        job = {
+            "command": "transcribe",
+            "audio_file": "",
+            "url": url,
+            "model_path": model_path,
+            "device": self.device_combo.currentText(),
+            "output_file": output_file,
+            "api_key": api_key,
+            "preset": self.preset_combo.currentText(),
+            "start": start,
+            "end": end,
+            "caption_policy": self.caption_combo.currentText(),
+            "stream": self.stream_checkbox.isChecked(),
+        }
+
+        # Prefer the long-lived transcription server, which already has the model loaded
+        if server_available():
+            self.log("Sending job to transcription server...")
+            self.server_socket = self.connect_to_server()
+            self.server_socket.readyRead.connect(self.handle_server_output)
+            self.server_socket.disconnected.connect(self.process_finished)
+            if self.server_socket.waitForConnected(1000):
+                self.server_socket.write((json.dumps(job) + "\n").encode('utf-8'))
+                return
+            self.log("Could not connect to transcription server, starting a new process instead.")
+            self.server_socket = None
+
         self.process = QProcess()
         self.process.readyReadStandardOutput.connect(self.handle_output)
         self.process.finished.connect(self.process_finished)
@@ -129,10 +260,21 @@ class MainWindow(QMainWindow):
         python_executable = sys.executable
         script_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'transcription_process.py')
         
-        self.process.start(python_executable, [script_path, audio_file, model_path, self.device_combo.currentText(), output_file, api_key])
+        self.process.start(python_executable, [script_path, job["audio_file"], model_path, job["device"], output_file, api_key, job["preset"],
+                                                  "" if start is None else str(start), "" if end is None else str(end), "", url, job["caption_policy"], "1" if job["stream"] else ""])
 
     def handle_output(self):
         raw_output = self.process.readAllStandardOutput().data().decode()
+        for line in raw_output.splitlines():
+            self.handle_event(line)
+
+    def handle_server_output(self):
+        while self.server_socket.canReadLine():
+            self.handle_event(self.server_socket.readLine().data().decode().strip())
+
+    def handle_event(self, raw_output):
+        if not raw_output:
+            return
         try:
             output = json.loads(raw_output)
             if output['status'] == 'error':
@@ -141,6 +283,8 @@ class MainWindow(QMainWindow):
                 self.log(output['status'])
                 if 'progress' in output:
                     self.progress_bar.setValue(output['progress'])
+                if output.get('transcript_source'):
+                    self.statusBar().showMessage(f"Transcript from {describe_transcript_source(output['transcript_source'])}")
         except json.JSONDecodeError:
             self.log(raw_output)
 
@@ -156,13 +300,23 @@ class MainWindow(QMainWindow):
         if self.process and self.process.state() == QProcess.ProcessState.Running:
             reply = QMessageBox.question(self, 'Process Running', 'A process is still running. Are you sure you want to close the window?',
                                          QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.No)
-            if reply == QMessageBox.StandardButton.Yes:
-                self.process.kill()
-                event.accept()
-            else:
+            if reply != QMessageBox.StandardButton.Yes:
                 event.ignore()
-        else:
-            event.accept()
+                return
+            self.process.kill()
+        # Only once the window is really closing, so answering No keeps the job's events coming
+        self.release_server()
+        event.accept()
+
+    def release_server(self):
+        if self.server_socket and self.server_socket.isOpen():
+            # Jobs running on the server keep going after the window closes
+            self.server_socket.disconnected.disconnect()
+            self.server_socket.close()
+        if self.server_pid and server_available():
+            # Only stop the server if this window started it, and let it finish the jobs it is running first
+            for event in shutdown_server():
+                logging.info(f"GUI: {event['status']}")
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
@@ -0,0 +1,18 @@
+import argparse
+from config import DEFAULT_MODEL_PATH, LIVE_MAX_LAG_SECONDS
+from utils.live import transcribe_live
+
+def main():
+    parser = argparse.ArgumentParser(description="Transcribe a live stream, a growing file or a named pipe as the audio arrives")
+    parser.add_argument("source", help="YouTube live URL, audio file that is still being written, or named pipe")
+    parser.add_argument("output_file")
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH)
+    parser.add_argument("--device", default="auto")
+    parser.add_argument("--max-lag", type=float, default=LIVE_MAX_LAG_SECONDS, help="maximum seconds the transcript may trail live audio")
+    parser.add_argument("--replay", action="store_true", help="play a finished audio file at real-time speed, for testing")
+    args = parser.parse_args()
+
+    transcribe_live(args.source, args.model, args.device, args.output_file, args.max_lag, args.replay)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
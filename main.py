@@ -1,6 +1,7 @@
 import sys
 import traceback
 from PyQt6.QtWidgets import QApplication, QMessageBox
+from PyQt6.QtCore import QTimer
 from gui.main_window import MainWindow
 
 def global_exception_handler(exctype, value, tb):
@@ -17,6 +18,8 @@ if __name__ == '__main__':
     try:
         window = MainWindow()
         window.show()
+        # Start loading the model once the window is on screen
+        QTimer.singleShot(0, window.start_preload)
         sys.exit(app.exec())
     except Exception as e:
         error_msg = f"An exception occurred in the main loop:\n{type(e).__name__}: {str(e)}\n\nTraceback:\n{traceback.format_exc()}"
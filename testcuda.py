@@ -1,3 +1,5 @@
-import torch
+from utils.device_util import probe_devices, resolve_device
 
-print(torch.cuda.is_available())
\ No newline at end of file
+probe = probe_devices()
+print(probe["cuda_devices"] > 0)
+print(resolve_device("auto", "auto"))
\ No newline at end of file
@@ -0,0 +1,55 @@
+import os
+import pytest
+from utils import captions
+from utils.transcript_source import load_transcript_source
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+def test_manual_srt_is_parsed_as_is():
+    segments = captions.load_caption_file(os.path.join(FIXTURES, "manual.srt"))
+    assert [(s.start, s.end) for s in segments] == [(1.0, 4.2), (4.2, 8.5), (8.5, 12.0), (12.0, 15.75)]
+    # Tags and entities are removed, multi-line cues are joined
+    assert segments[1].text == " Today we are looking at memory-mapped audio caches."
+    assert segments[2].text == " Tom & Jerry explain why."
+
+def test_rolling_auto_captions_are_deduplicated():
+    segments = captions.parse_captions(read_fixture("auto.vtt"), dedupe=True)
+    assert [s.text for s in segments] == [" so today we", " are talking about", " captions & transcripts", " [Music]"]
+    assert [(s.start, s.end) for s in segments] == [(0.32, 2.95), (2.96, 5.11), (5.12, 7.9), (7.91, 10.4)]
+
+def test_rolling_auto_captions_repeat_without_dedupe():
+    texts = [s.text for s in captions.parse_captions(read_fixture("auto.vtt"))]
+    assert texts.count(" so today we") == 2
+
+@pytest.fixture
+def caption_video(monkeypatch):
+    metadata = {"id": "abcdefghijk", "subtitles": {"en": [{"ext": "vtt", "url": "https://example.invalid/en.vtt"}]},
+                "automatic_captions": {}}
+    monkeypatch.setattr(captions, "probe_video", lambda url, use_cache=True: metadata)
+    monkeypatch.setattr(captions, "fetch_captions", lambda url: read_fixture("manual.srt"))
+    return "https://www.youtube.com/watch?v=abcdefghijk"
+
+def test_window_keeps_cues_overlapping_start_and_end(caption_video, tmp_path):
+    output_file = str(tmp_path / "out.txt")
+    events = []
+    source = captions.transcribe_from_captions(caption_video, output_file, policy="manual", start=4.5, end=9.0, emit=events.append)
+    assert source == {"source": "captions", "kind": "manual", "language": "en", "video_id": "abcdefghijk"}
+    with open(output_file, 'r', encoding='utf-8') as f:
+        transcript = f.read()
+    assert "memory-mapped" in transcript and "Tom & Jerry" in transcript
+    assert "Welcome back" not in transcript and "get started" not in transcript
+    assert load_transcript_source(output_file)["kind"] == "manual"
+    assert events[-1]["transcript_source"] == source
+
+def test_window_without_cues_falls_back_to_whisper(caption_video, tmp_path):
+    output_file = str(tmp_path / "out.txt")
+    assert captions.transcribe_from_captions(caption_video, output_file, policy="manual", start=20.0, emit=lambda event: None) is None
+    assert not os.path.exists(output_file)
+
+def test_policy_off_never_probes(caption_video, monkeypatch, tmp_path):
+    monkeypatch.setattr(captions, "probe_video", lambda url, use_cache=True: pytest.fail("probed with policy off"))
+    assert captions.transcribe_from_captions(caption_video, str(tmp_path / "out.txt"), policy="off") is None
@@ -0,0 +1,23 @@
+from utils.checkpoint import settings_key, load_checkpoint, save_checkpoint
+
+def make_job(tmp_path):
+    audio_file = tmp_path / "audio.webm"
+    audio_file.write_bytes(b"audio")
+    output_file = tmp_path / "out.txt"
+    output_file.write_text("[0.00 -> 1.00]  hello\n", encoding='utf-8')
+    return str(audio_file), str(output_file)
+
+def test_checkpoint_resumes_with_the_same_settings(tmp_path):
+    audio_file, output_file = make_job(tmp_path)
+    settings = settings_key("models/small", "int8", {"beam_size": 5, "start": None, "end": None})
+    save_checkpoint(output_file, audio_file, settings, 1.0, 10)
+    checkpoint = load_checkpoint(output_file, audio_file, settings_key("models/small", "int8", {"end": None, "start": None, "beam_size": 5}))
+    assert checkpoint["offset"] == 1.0 and checkpoint["bytes"] == 10
+
+def test_checkpoint_with_other_settings_is_ignored(tmp_path):
+    audio_file, output_file = make_job(tmp_path)
+    save_checkpoint(output_file, audio_file, settings_key("models/small", "int8", {"beam_size": 5, "start": None}), 1.0, 10)
+    assert load_checkpoint(output_file, audio_file, settings_key("models/small", "int8", {"beam_size": 1, "start": None})) is None
+    assert load_checkpoint(output_file, audio_file, settings_key("models/small", "int8", {"beam_size": 5, "start": 30.0})) is None
+    assert load_checkpoint(output_file, audio_file, settings_key("models/large", "int8", {"beam_size": 5, "start": None})) is None
+    assert load_checkpoint(output_file, audio_file, settings_key("models/small", "float32", {"beam_size": 5, "start": None})) is None
@@ -0,0 +1,23 @@
+from utils.json_index import JsonIndex
+
+def test_updates_from_two_instances_are_merged(tmp_path):
+    path = str(tmp_path / "index.json")
+    first, second = JsonIndex(path, {"entries": {}}), JsonIndex(path, {"entries": {}})
+    assert first.read() == {"entries": {}}
+    with first.update() as index:
+        index["entries"]["a"] = 1
+    with second.update() as index:
+        index["entries"]["b"] = 2
+    # first re-reads the file that second replaced
+    assert first.read() == {"entries": {"a": 1, "b": 2}}
+
+def test_failed_update_is_not_written(tmp_path):
+    path = str(tmp_path / "index.json")
+    index_file = JsonIndex(path, {"entries": {}})
+    try:
+        with index_file.update() as index:
+            index["entries"]["a"] = 1
+            raise ValueError
+    except ValueError:
+        pass
+    assert index_file.read() == {"entries": {}}
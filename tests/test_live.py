@@ -0,0 +1,72 @@
+import io
+import time
+import numpy as np
+import pytest
+from utils import live
+from utils.audio_util import SAMPLE_RATE
+from utils.segment_util import ChunkSegment
+
+class FakeProcess:
+    def __init__(self, stdout):
+        self.stdout = stdout
+
+    def terminate(self):
+        pass
+
+    def wait(self):
+        pass
+
+class RealTimeStream:
+    # Delivers `seconds` of audio no faster than real time, like a live source
+    def __init__(self, seconds):
+        self.remaining = int(seconds * SAMPLE_RATE) * 4
+        self.started = time.time()
+        self.sent = 0
+
+    def read(self, size):
+        size = min(size, self.remaining)
+        if not size:
+            return b""
+        due = self.started + (self.sent + size) / 4 / SAMPLE_RATE
+        time.sleep(max(due - time.time(), 0.0))
+        self.sent += size
+        self.remaining -= size
+        return np.zeros(size // 4, dtype=np.float32).tobytes()
+
+class FakeModel:
+    # One segment per second of the window; decode_seconds simulates a model slower or faster than real time
+    def __init__(self, decode_seconds=0.0):
+        self.decode_seconds = decode_seconds
+
+    def transcribe(self, audio, **options):
+        time.sleep(self.decode_seconds)
+        seconds = int(len(audio) / SAMPLE_RATE)
+        return [ChunkSegment(float(i), float(i + 1), " word", 0.0, 0.0, 0.0) for i in range(seconds)], None
+
+@pytest.fixture
+def run_live(monkeypatch, tmp_path):
+    monkeypatch.setattr(live, "resolve_device", lambda device, compute_type: ("cpu", "int8"))
+    monkeypatch.setattr(live, "resolve_model_path", lambda model_path, device, compute_type: model_path)
+    monkeypatch.setattr(live, "record_transcript_source", lambda output_file, source: None)
+
+    def run(stream, model, **kwargs):
+        monkeypatch.setattr(live, "open_live_source", lambda source, replay=False: (FakeProcess(stream),))
+        monkeypatch.setattr(live, "get_service", lambda *args: model)
+        output_file = tmp_path / "live.txt"
+        stats = live.transcribe_live("source", "model", "cpu", str(output_file), emit=lambda event: None, **kwargs)
+        return stats, output_file.read_text(encoding='utf-8').splitlines()
+    return run
+
+def test_audio_arriving_faster_than_real_time_is_not_skipped(run_live):
+    # A followed file hands over its existing 45 seconds at once, longer than the live window
+    stream = io.BytesIO(np.zeros(45 * SAMPLE_RATE, dtype=np.float32).tobytes())
+    stats, lines = run_live(stream, FakeModel())
+    assert stats["skipped_seconds"] == 0.0
+    assert len(lines) == 45
+    assert lines[-1].startswith("[44.00s -> 45.00s]")
+
+def test_oldest_audio_is_skipped_when_decoding_falls_behind(run_live, monkeypatch):
+    monkeypatch.setattr(live, "LIVE_WINDOW_SECONDS", 1.0)
+    monkeypatch.setattr(live, "LIVE_STEP_SECONDS", 0.2)
+    stats, _ = run_live(RealTimeStream(2.5), FakeModel(decode_seconds=1.5), max_lag=0.5)
+    assert stats["skipped_seconds"] > 0.0
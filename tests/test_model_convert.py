@@ -0,0 +1,40 @@
+import ctranslate2
+import pytest
+from utils import device_util, model_convert
+
+@pytest.fixture
+def conversions(monkeypatch, tmp_path):
+    def install(*quantizations):
+        entries = []
+        for i, quantization in enumerate(quantizations):
+            path = tmp_path / quantization
+            path.mkdir()
+            entries.append({"source": "openai/whisper-small", "alias": "small", "quantization": quantization, "path": str(path),
+                            "ctranslate2_version": ctranslate2.__version__, "size": 0, "created": float(i)})
+        monkeypatch.setattr(model_convert, "load_manifest", lambda: entries)
+        return {e["quantization"]: e["path"] for e in entries}
+    return install
+
+@pytest.mark.parametrize("compute_type", ["int8", "int8_float32", "int8_float16", "int8_bfloat16"])
+def test_int8_conversion_serves_every_int8_compute_type(conversions, compute_type):
+    paths = conversions("int8")
+    assert model_convert.find_converted_model("small", "cpu", compute_type) == paths["int8"]
+
+@pytest.mark.parametrize("quantization,compute_type", [("int8", "float16"), ("int8", "float32"), ("float16", "int8_float16"),
+                                                       ("float16", "float32"), ("float32", "float16"), ("int8", "default")])
+def test_conversion_in_another_precision_is_not_used(conversions, quantization, compute_type):
+    conversions(quantization)
+    assert model_convert.find_converted_model("small", "cuda", compute_type) is None
+
+def test_exact_match_is_preferred_over_newer_compatible_one(conversions):
+    paths = conversions("int8_float16", "int8")
+    assert model_convert.find_converted_model("small", "cuda", "int8_float16") == paths["int8_float16"]
+    assert model_convert.find_converted_model("small", "cpu", "int8_float32") == paths["int8"]
+
+def test_default_conversion_is_picked_up_on_cpu(conversions, monkeypatch):
+    # convert_model.py defaults to int8, resolve_device prefers int8_float32 on CPU
+    paths = conversions("int8")
+    monkeypatch.setattr(device_util, "probe_devices", lambda: {"cuda_devices": 0, "cpu": ["float32", "int8", "int8_float32"], "cuda": []})
+    device, compute_type = device_util.resolve_device("cpu", "auto")
+    assert compute_type == "int8_float32"
+    assert model_convert.resolve_model_path("openai/whisper-small", device, compute_type) == paths["int8"]
@@ -0,0 +1,48 @@
+import os
+import re
+from utils.repetition import RepetitionDetector, has_ngram_loop, normalize_text
+from utils.segment_util import ChunkSegment
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+LINE = re.compile(r'\[(\d+\.\d+)s -> (\d+\.\d+)s\]\s*(.*)')
+
+def load_transcript(name):
+    # Lines in the transcript format, taken from a real run that looped (robf.txt)
+    with open(os.path.join(FIXTURES, name), 'r', encoding='utf-8') as f:
+        matches = [LINE.match(line) for line in f]
+    return [ChunkSegment(float(m.group(1)), float(m.group(2)), " " + m.group(3), 0.0, 0.0, 0.0) for m in matches if m]
+
+def run_detector(segments):
+    detector = RepetitionDetector(max_repeats=3, ngram_size=3)
+    released = []
+    for segment in segments:
+        released += detector.push(segment)
+        if detector.loop_start is not None:
+            return detector, released
+    return detector, released + detector.flush()
+
+def test_repeated_lines_fire_the_detector():
+    detector, released = run_detector(load_transcript("looping_transcript.txt"))
+    assert detector.loop_start == 200.12
+    assert [s.start for s in detector.discarded] == [200.12, 201.12]
+    # The first copy of the line is real speech and was already released
+    assert released[-1].text == " I've always wanted to do it."
+
+def test_normal_speech_does_not_fire():
+    segments = [s for s in load_transcript("looping_transcript.txt") if s.start < 199.0]
+    detector, released = run_detector(segments)
+    assert detector.loop_start is None
+    # Two copies of a line ("That's what I've done.") are below the threshold and pass through unchanged
+    assert released == segments
+
+def test_loop_inside_one_segment_fires():
+    segment = ChunkSegment(10.0, 40.0, " and then we went to the and then we went to the and then we went to the and then we went to the",
+                           0.0, 0.0, 0.0)
+    detector, released = run_detector([segment])
+    assert released == [] and detector.loop_start == 10.0
+
+def test_has_ngram_loop():
+    assert has_ngram_loop(normalize_text("Thank you. Thank you. Thank you. Thank you. Thank you. Thank you."), 3, 3)
+    assert not has_ngram_loop(normalize_text("It's about creating that seamless content experience that drives value."), 3, 3)
+    # Too short to judge
+    assert not has_ngram_loop(normalize_text("Yeah yeah yeah."), 3, 3)
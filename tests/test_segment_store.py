@@ -0,0 +1,55 @@
+from collections import namedtuple
+import pytest
+from utils.segment_store import SegmentStore, Word
+
+Segment = namedtuple("Segment", ["start", "end", "text", "avg_logprob", "compression_ratio", "no_speech_prob", "words"])
+
+def make_segments():
+    return [
+        Segment(0.0, 2.5, " Hello there.", -0.25, 1.5, 0.125, [Word(0.0, 1.0, " Hello", 0.5), Word(1.0, 2.5, " there.", 0.75)]),
+        Segment(2.5, 5.0, " Grüße aus Köln, 東京 too.", -0.5, 1.25, 0.0, [Word(2.5, 3.0, " Grüße", 0.25), Word(4.0, 5.0, " 東京", 1.0)]),
+        Segment(5.0, 9.0, " No words here.", -1.0, 2.0, 0.5, None),
+        Segment(9.0, 12.0, " Last one.", -0.125, 1.0, 0.25, []),
+    ]
+
+def as_tuples(store):
+    return [tuple(segment) for segment in store]
+
+@pytest.fixture(params=["memory", "loaded"])
+def store(request, tmp_path):
+    store = SegmentStore()
+    store.extend(make_segments())
+    if request.param == "loaded":
+        store.save(str(tmp_path / "store.seg"))
+        store = SegmentStore.load(str(tmp_path / "store.seg"))
+    return store
+
+def test_segments_and_words_round_trip(store):
+    # Values are exactly representable in float32, so they survive the float arrays unchanged
+    assert as_tuples(store) == [tuple(s[:6]) for s in make_segments()]
+    assert list(store.words(1)) == make_segments()[1].words
+    assert list(store.words(2)) == [] and list(store.words(3)) == []
+
+def test_time_range(store):
+    assert [s.text for s in store.time_range(2.6, 5.0)] == [" Grüße aus Köln, 東京 too."]
+    # Segments touching the bounds are not included, overlapping ones are
+    assert [s.start for s in store.time_range(2.5, 9.5)] == [2.5, 5.0, 9.0]
+    assert [s.start for s in store.time_range(0.0, 100.0)] == [0.0, 2.5, 5.0, 9.0]
+    view = store.time_range(4.0, 6.0)
+    assert len(view) == 2 and view[1].text == " No words here." and list(view.start) == [2.5, 5.0]
+    assert len(store.time_range(20.0, 30.0)) == 0
+    with pytest.raises(IndexError):
+        view[2]
+
+def test_empty_store_round_trips(tmp_path):
+    path = str(tmp_path / "empty.seg")
+    SegmentStore().save(path)
+    store = SegmentStore.load(path)
+    assert len(store) == 0 and list(store) == []
+    assert len(store.time_range(0.0, 10.0)) == 0
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / "other.seg"
+    path.write_bytes(b"not a segment store at all")
+    with pytest.raises(ValueError):
+        SegmentStore.load(str(path))
@@ -0,0 +1,36 @@
+import pytest
+from utils import youtube_utils
+from utils.audio_cache import AudioCache
+
+URL = "https://www.youtube.com/watch?v=abcdefghijk"
+
+@pytest.fixture
+def cache(monkeypatch, tmp_path):
+    cache = AudioCache(str(tmp_path / "audio"))
+    monkeypatch.setattr(youtube_utils, "audio_cache", cache)
+    monkeypatch.setattr(youtube_utils, "AUDIO_CACHE", True)
+    return cache
+
+def put_audio(cache, tmp_path, key, duration):
+    path = tmp_path / f"{key}.webm"
+    path.write_bytes(b"audio")
+    cache.put(key, str(path), "A title: part 1", duration)
+
+def test_cached_download_needs_no_probe(cache, monkeypatch, tmp_path):
+    put_audio(cache, tmp_path, "abcdefghijk", 312.0)
+    monkeypatch.setattr(youtube_utils, "probe_video", lambda url: pytest.fail("probed a cached video"))
+    assert youtube_utils.get_video_info(URL) == ("A_title_part_1", 312.0)
+    # Metadata lookups do not count as cache hits
+    assert cache.stats()["hits"] == 0
+
+def test_uncached_or_partial_download_is_probed(cache, monkeypatch, tmp_path):
+    # Only a section was downloaded, its duration is not the video's
+    put_audio(cache, tmp_path, "abcdefghijk_0-60", 60.0)
+    monkeypatch.setattr(youtube_utils, "probe_video", lambda url: {"title": "Probed", "duration": 900.0})
+    assert youtube_utils.get_video_info(URL) == ("Probed", 900.0)
+
+def test_removed_file_is_probed(cache, monkeypatch, tmp_path):
+    put_audio(cache, tmp_path, "abcdefghijk", 312.0)
+    (tmp_path / "audio" / "abcdefghijk.webm").unlink()
+    monkeypatch.setattr(youtube_utils, "probe_video", lambda url: {"title": "Probed", "duration": 900.0})
+    assert youtube_utils.get_video_info(URL) == ("Probed", 900.0)
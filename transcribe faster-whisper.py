@@ -1,9 +1,10 @@
 from faster_whisper import WhisperModel
-import torch
+from utils.device_util import resolve_device
 
 model_size = "large-v3"
-# Run on GPU with FP16
-model = WhisperModel(model_size, device="cuda", compute_type="float16")
+# Run on GPU with FP16 when available, otherwise int8 on CPU
+device, compute_type = resolve_device("auto", "auto")
+model = WhisperModel(model_size, device=device, compute_type=compute_type)
 
 segments, info = model.transcribe("youtube-video-audio.mp3", beam_size=5, language="en")
 
@@ -0,0 +1,25 @@
+import json
+import sys
+from utils.server_client import server_available, send_request, preload_model, shutdown_server, submit_job
+
+def print_events(events):
+    for event in events:
+        print(json.dumps(event))
+        sys.stdout.flush()
+
+if __name__ == "__main__":
+    if not server_available():
+        print(json.dumps({"status": "error", "message": "Transcription server is not running. Start it with: python transcription_server.py"}))
+        sys.exit(1)
+    if len(sys.argv) > 1 and sys.argv[1] == "stats":
+        print_events(send_request({"command": "stats"}))
+    elif len(sys.argv) > 1 and sys.argv[1] == "shutdown":
+        print_events(shutdown_server())
+    elif len(sys.argv) > 1 and sys.argv[1] == "preload":
+        print_events(preload_model(sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else "auto"))
+    else:
+        preset = sys.argv[6] if len(sys.argv) > 6 and sys.argv[6] else None
+        start, end, audio_start = [float(arg) if arg else None for arg in (sys.argv[7:10] + [""] * 3)[:3]]
+        # The first argument may be a video URL instead of a local audio file
+        audio_file, url = ("", sys.argv[1]) if "://" in sys.argv[1] else (sys.argv[1], None)
+        print_events(submit_job(audio_file, sys.argv[2], sys.argv[3], sys.argv[4], sys.argv[5], preset, start, end, audio_start or 0.0, url))
\ No newline at end of file
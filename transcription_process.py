@@ -1,27 +1,43 @@
 import sys
-import json
 import os
+from config import CAPTION_POLICY
+from utils.events import print_event
 from utils.transcription_util import transcribe_audio
+from utils.captions import transcribe_from_captions
+from utils.streaming import transcribe_stream
+from utils.transcript_source import load_transcript_source
+from utils.youtube_utils import download_or_use_existing_audio, get_video_info
 from utils.claude_utils import process_with_claude, read_transcript
 
-def main(audio_file, model_path, device, output_file, api_key):
+def main(audio_file, model_path, device, output_file, api_key, preset=None, start=None, end=None, audio_start=0.0, url=None, caption_policy=CAPTION_POLICY, stream=False, emit=print_event):
     try:
-        print(json.dumps({"status": "Starting transcription"}))
-        sys.stdout.flush()
-
-        # Verify that the audio file exists
-        if not os.path.exists(audio_file):
-            raise FileNotFoundError(f"Audio file not found: {audio_file}")
-
-        transcribe_audio(audio_file, model_path, device, output_file)
-
-        print(json.dumps({"status": "Transcription completed"}))
-        sys.stdout.flush()
+        emit({"status": "Starting transcription"})
+
+        # Jobs given a URL instead of a file use the video's captions when they are good enough, and otherwise
+        # either stream the audio into the model while it downloads or download it first
+        if url and not audio_file:
+            source = transcribe_from_captions(url, output_file, policy=caption_policy, start=start, end=end, emit=emit)
+            if not source and stream:
+                _, duration = get_video_info(url)
+                transcribe_stream(url, model_path, device, output_file, duration, start=start, end=end, preset=preset, emit=emit)
+            elif not source:
+                emit({"status": "Downloading audio"})
+                audio_file, _ = download_or_use_existing_audio(url, start, end)
+                # Only the requested range was downloaded, so the file begins at `start`
+                audio_start = start or 0.0
+
+        if audio_file:
+            # Verify that the audio file exists
+            if not os.path.exists(audio_file):
+                raise FileNotFoundError(f"Audio file not found: {audio_file}")
+
+            transcribe_audio(audio_file, model_path, device, output_file, preset=preset, start=start, end=end, audio_start=audio_start, emit=emit)
+
+        emit({"status": "Transcription completed"})
 
         transcript_text = read_transcript(output_file)
         
-        print(json.dumps({"status": "Starting Claude API processing"}))
-        sys.stdout.flush()
+        emit({"status": "Starting Claude API processing"})
 
         markdown_output = process_with_claude(api_key, transcript_text)
         
@@ -29,12 +45,17 @@ def main(audio_file, model_path, device, output_file, api_key):
         with open(markdown_file, 'w', encoding='utf-8') as f:
             f.write(markdown_output)
 
-        print(json.dumps({"status": "Process completed", "output_file": output_file, "markdown_file": markdown_file}))
-        sys.stdout.flush()
+        emit({"status": "Process completed", "output_file": output_file, "markdown_file": markdown_file, "transcript_source": load_transcript_source(output_file)})
 
     except Exception as e:
-        print(json.dumps({"status": "error", "message": str(e)}))
-        sys.stdout.flush()
+        emit({"status": "error", "message": str(e)})
 
 if __name__ == "__main__":
-    main(sys.argv[1], sys.argv[2], sys.argv[3], sys.argv[4], sys.argv[5])
\ No newline at end of file
+    preset = sys.argv[6] if len(sys.argv) > 6 and sys.argv[6] else None
+    # Optional time window in seconds; an empty argument means no limit
+    start, end, audio_start = [float(arg) if arg else None for arg in (sys.argv[7:10] + [""] * 3)[:3]]
+    url = sys.argv[10] if len(sys.argv) > 10 else None
+    caption_policy = sys.argv[11] if len(sys.argv) > 11 and sys.argv[11] else CAPTION_POLICY
+    # Any non-empty argument turns on streaming
+    stream = len(sys.argv) > 12 and bool(sys.argv[12])
+    main(sys.argv[1], sys.argv[2], sys.argv[3], sys.argv[4], sys.argv[5], preset, start, end, audio_start or 0.0, url, caption_policy, stream)
\ No newline at end of file
@@ -0,0 +1,135 @@
+import json
+import logging
+import os
+import socketserver
+import sys
+import threading
+import time
+from config import SERVER_ADDRESS, CAPTION_POLICY
+from utils.device_util import resolve_device
+from utils.model_convert import resolve_model_path
+from utils.model_pool import model_pool
+from utils.transcription_service import get_service
+from transcription_process import main as run_job
+
+class TranscriptionRequestHandler(socketserver.StreamRequestHandler):
+    def emit(self, event):
+        try:
+            self.wfile.write((json.dumps(event) + "\n").encode('utf-8'))
+            self.wfile.flush()
+        except OSError:
+            # The client went away; keep the job running so its output files are still written
+            pass
+
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            self.emit({"status": "error", "message": f"Invalid request: {str(e)}"})
+            return
+
+        command = request.get("command", "transcribe")
+        if command == "stats":
+            self.emit({"status": "stats", "model_pool": model_pool.stats()})
+        elif command == "preload":
+            self.preload(request)
+        elif command == "transcribe":
+            self.transcribe(request)
+        elif command == "shutdown":
+            running = self.server.shutdown_when_idle()
+            self.emit({"status": f"Server will stop after {running} running job(s)" if running else "Server stopping"})
+        else:
+            self.emit({"status": "error", "message": f"Unknown command: {command}"})
+
+    def preload(self, request):
+        # Jobs that arrive while this is running wait on the same load instead of starting their own
+        device, compute_type = resolve_device(request.get("device", "auto"), request.get("compute_type", "auto"))
+        model_path = resolve_model_path(request["model_path"], device, compute_type)
+        self.emit({"status": f"Loading model {model_path} on {device} ({compute_type})..."})
+        start_time = time.time()
+        try:
+            get_service(model_path, device, compute_type)
+        except Exception as e:
+            logging.exception("Server: model preload failed")
+            self.emit({"status": "error", "message": f"Model preload failed: {str(e)}"})
+            return
+        self.emit({"status": f"Model loaded in {time.time() - start_time:.1f} seconds", "model_loaded": True})
+
+    def transcribe(self, request):
+        # Jobs run concurrently; the transcription service queues them fairly on the one resident model
+        job_name = request.get("audio_file") or request.get("url")
+        logging.info(f"Server: starting job for {job_name}")
+        start_time = time.time()
+        self.server.job_started()
+        try:
+            run_job(request.get("audio_file", ""), request["model_path"], request["device"], request["output_file"], request.get("api_key", ""), preset=request.get("preset"),
+                    start=request.get("start"), end=request.get("end"), audio_start=request.get("audio_start", 0.0), url=request.get("url"),
+                    caption_policy=request.get("caption_policy") or CAPTION_POLICY, stream=bool(request.get("stream")), emit=self.emit)
+        finally:
+            self.server.job_finished()
+        logging.info(f"Server: job for {job_name} finished in {time.time() - start_time:.2f} seconds")
+
+class JobTrackingMixIn:
+    daemon_threads = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._jobs_lock = threading.Lock()
+        self._running_jobs = 0
+        self._stop_when_idle = False
+
+    def job_started(self):
+        with self._jobs_lock:
+            self._running_jobs += 1
+
+    def job_finished(self):
+        with self._jobs_lock:
+            self._running_jobs -= 1
+            stop = self._stop_when_idle and not self._running_jobs
+        if stop:
+            self.stop()
+
+    def shutdown_when_idle(self):
+        # Running jobs are finished first so their transcripts are complete; returns how many there are
+        with self._jobs_lock:
+            self._stop_when_idle = True
+            running = self._running_jobs
+        if not running:
+            self.stop()
+        return running
+
+    def stop(self):
+        # shutdown() waits for serve_forever to return, so it cannot run on a thread serve_forever is waiting on
+        threading.Thread(target=self.shutdown, daemon=True).start()
+
+class TCPTranscriptionServer(JobTrackingMixIn, socketserver.ThreadingTCPServer):
+    pass
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+    class TranscriptionServer(JobTrackingMixIn, socketserver.ThreadingUnixStreamServer):
+        pass
+
+def serve(address=SERVER_ADDRESS):
+    # Unix socket path, or (host, port) on platforms without Unix sockets
+    if isinstance(address, tuple):
+        server = TCPTranscriptionServer(address, TranscriptionRequestHandler)
+    else:
+        if os.path.exists(address):
+            os.remove(address)
+        server = TranscriptionServer(address, TranscriptionRequestHandler)
+    with server:
+        print(f"Transcription server listening on {address}", flush=True)
+        logging.info(f"Server: listening on {address}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if not isinstance(address, tuple):
+                os.remove(address)
+
+if __name__ == "__main__":
+    serve(sys.argv[1] if len(sys.argv) > 1 else SERVER_ADDRESS)
\ No newline at end of file
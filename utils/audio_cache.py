@@ -0,0 +1,85 @@
+import logging
+import os
+import re
+import time
+from config import AUDIO_CACHE_DIR, AUDIO_CACHE_MAX_MB
+from utils.json_index import JsonIndex
+
+VIDEO_ID_PATTERN = re.compile(r'(?:v=|youtu\.be/|/shorts/|/live/|/embed/|/v/)([0-9A-Za-z_-]{11})')
+
+def extract_video_id(url):
+    # Parsed from the URL alone so a cache lookup never needs the network; None for URLs we do not recognise
+    if re.fullmatch(r'[0-9A-Za-z_-]{11}', url):
+        return url
+    match = VIDEO_ID_PATTERN.search(url)
+    return match.group(1) if match else None
+
+class AudioCache:
+    # index.json maps "<video id><range suffix>" to the file and what we know about it. Lookups use an in-memory
+    # copy, so they are a dict access no matter how many files are cached; see JsonIndex for sharing between processes.
+    def __init__(self, cache_dir=AUDIO_CACHE_DIR, max_mb=AUDIO_CACHE_MAX_MB):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_mb * 1024 * 1024
+        self.index_file = os.path.join(cache_dir, "index.json")
+        self._index = JsonIndex(self.index_file, {"entries": {}, "hits": 0, "misses": 0})
+
+    def get(self, key):
+        # Returns the index entry (path, format, duration, size, title) or None
+        with self._index.update() as index:
+            entry = index["entries"].get(key)
+            if entry is not None and not os.path.exists(entry["path"]):
+                logging.info(f"Audio cache: {entry['path']} was removed, dropping {key}")
+                del index["entries"][key]
+                entry = None
+            if entry is None:
+                index["misses"] += 1
+                return None
+            entry["last_access"] = time.time()
+            index["hits"] += 1
+            return dict(entry)
+
+    def peek(self, key):
+        # Like get(), but for metadata only: no lock, and hits, misses and the LRU order are left alone
+        entry = self._index.read()["entries"].get(key)
+        if entry is None or not os.path.exists(entry["path"]):
+            return None
+        return dict(entry)
+
+    def put(self, key, path, title=None, duration=None):
+        # Moves the finished file into the cache; os.replace is atomic, so other jobs see either no file or all of it
+        os.makedirs(self.cache_dir, exist_ok=True)
+        cached_path = os.path.join(self.cache_dir, f"{key}{os.path.splitext(path)[1]}")
+        if os.path.abspath(path) != cached_path:
+            os.replace(path, cached_path)
+        with self._index.update() as index:
+            index["entries"][key] = {
+                "path": cached_path,
+                "format": os.path.splitext(path)[1].lstrip("."),
+                "duration": duration,
+                "size": os.path.getsize(cached_path),
+                "title": title,
+                "last_access": time.time(),
+            }
+            self._evict(index, keep=key)
+            return dict(index["entries"][key])
+
+    def _evict(self, index, keep=None):
+        entries = index["entries"]
+        total = sum(entry["size"] for entry in entries.values())
+        for key in sorted(entries, key=lambda k: entries[k]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            entry = entries.pop(key)
+            total -= entry["size"]
+            if os.path.exists(entry["path"]):
+                os.remove(entry["path"])
+            logging.info(f"Audio cache: evicted {key}")
+
+    def stats(self):
+        index = self._index.read()
+        return {"hits": index["hits"], "misses": index["misses"], "entries": len(index["entries"]),
+                "size_mb": round(sum(e["size"] for e in index["entries"].values()) / (1024 * 1024), 2)}
+
+audio_cache = AudioCache()
\ No newline at end of file
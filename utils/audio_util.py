@@ -0,0 +1,114 @@
+import hashlib
+import logging
+import os
+import threading
+import numpy as np
+from faster_whisper import decode_audio
+from config import PCM_CACHE, PCM_CACHE_DIR, PCM_CACHE_MAX_MB
+
+SAMPLE_RATE = 16000
+
+def pcm_cache_path(audio_file):
+    stat = os.stat(audio_file)
+    file_key = f"{os.path.abspath(audio_file)}|{stat.st_size}|{stat.st_mtime_ns}"
+    return os.path.join(PCM_CACHE_DIR, hashlib.sha1(file_key.encode('utf-8')).hexdigest() + ".npy")
+
+def load_audio(audio, use_cache=PCM_CACHE):
+    # Accepts a file path or an already decoded 16 kHz mono array.
+    # Paths are decoded once into the PCM cache and then memory-mapped, so pages are only read as they are used.
+    if not isinstance(audio, str):
+        return audio
+    if not use_cache:
+        return decode_audio(audio, sampling_rate=SAMPLE_RATE)
+    cache_path = pcm_cache_path(audio)
+    if not os.path.exists(cache_path):
+        logging.info(f"Decoding {audio} into PCM cache {cache_path}")
+        samples = decode_audio(audio, sampling_rate=SAMPLE_RATE)
+        os.makedirs(PCM_CACHE_DIR, exist_ok=True)
+        # One temporary file per writer, concurrent jobs may decode the same file. np.save appends .npy to
+        # names that lack it, so the temporary name keeps the extension.
+        tmp_path = f"{cache_path[:-4]}.{os.getpid()}.{threading.get_ident()}.tmp.npy"
+        np.save(tmp_path, samples.astype(np.float32, copy=False))
+        try:
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            # Another writer got there first and the file is mapped by then (Windows refuses to replace it)
+            os.remove(tmp_path)
+            if not os.path.exists(cache_path):
+                raise
+        evict_pcm_cache(keep=cache_path)
+    else:
+        # The mtime doubles as the last access time for eviction
+        os.utime(cache_path)
+    return np.load(cache_path, mmap_mode='r')
+
+def evict_pcm_cache(max_mb=PCM_CACHE_MAX_MB, keep=None):
+    # Removes least recently used .npy files until the cache fits. Files whose source audio was deleted
+    # (or re-downloaded, which changes the key) are never loaded again, so they age out the same way.
+    files = []
+    for name in os.listdir(PCM_CACHE_DIR):
+        path = os.path.join(PCM_CACHE_DIR, name)
+        if not name.endswith(".npy") or ".tmp." in name or path == keep:
+            continue
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        files.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in files)
+    if keep and os.path.exists(keep):
+        total += os.path.getsize(keep)
+    max_bytes = max_mb * 1024 * 1024
+    for _, size, path in sorted(files):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            # Still memory-mapped by another process on Windows, or already removed by one
+            continue
+        total -= size
+        logging.info(f"PCM cache: evicted {path}")
+
+def frame_energy(audio, frame_seconds=0.1):
+    frame_length = int(SAMPLE_RATE * frame_seconds)
+    frame_count = len(audio) // frame_length
+    frames = np.asarray(audio[:frame_count * frame_length], dtype=np.float32).reshape(frame_count, frame_length)
+    return np.sqrt(np.mean(frames ** 2, axis=1))
+
+def find_quiet_point(audio, search_seconds=10.0, frame_seconds=0.1):
+    # Sample offset of the quietest frame within the last search_seconds of the array
+    frame_length = int(SAMPLE_RATE * frame_seconds)
+    search_start = max(len(audio) - int(search_seconds * SAMPLE_RATE), 0)
+    energy = frame_energy(audio[search_start:], frame_seconds)
+    if not len(energy):
+        return len(audio)
+    return search_start + int(np.argmin(energy)) * frame_length + frame_length // 2
+
+def find_silence_split_points(audio, chunk_seconds, search_seconds=10.0, frame_seconds=0.1):
+    # Returns sample offsets close to every chunk_seconds boundary, moved to the quietest frame nearby
+    # so chunks are not cut in the middle of a word
+    duration = len(audio) / SAMPLE_RATE
+    if duration <= chunk_seconds:
+        return []
+    energy = frame_energy(audio, frame_seconds)
+    search_frames = int(search_seconds / frame_seconds)
+    split_points = []
+    boundary = chunk_seconds
+    while boundary < duration - search_seconds:
+        center = int(boundary / frame_seconds)
+        low = max(center - search_frames, 0)
+        high = min(center + search_frames, len(energy))
+        quietest = low + int(np.argmin(energy[low:high]))
+        split = (quietest * 2 + 1) * int(SAMPLE_RATE * frame_seconds) // 2
+        if not split_points or split > split_points[-1]:
+            split_points.append(split)
+        boundary += chunk_seconds
+    return split_points
+
+def split_audio(audio, chunk_seconds, search_seconds=10.0):
+    # Yields (offset in seconds, chunk) pairs covering the whole array
+    start = 0
+    for split in find_silence_split_points(audio, chunk_seconds, search_seconds) + [len(audio)]:
+        yield start / SAMPLE_RATE, audio[start:split]
+        start = split
\ No newline at end of file
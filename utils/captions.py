@@ -0,0 +1,98 @@
+import html
+import logging
+import re
+import urllib.request
+from config import CAPTION_POLICY, CAPTION_LANGUAGES
+from utils.events import print_event
+from utils.segment_sink import SegmentSink
+from utils.segment_util import ChunkSegment
+from utils.transcript_source import record_transcript_source
+from utils.video_probe import probe_video
+
+TIMESTAMP = re.compile(r'(?:(\d+):)?(\d{1,2}):(\d{2})[.,](\d{3})')
+TAG = re.compile(r'<[^>]*>')
+
+def parse_timestamp(value):
+    hours, minutes, seconds, millis = TIMESTAMP.match(value).groups()
+    return int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds) + int(millis) / 1000
+
+def parse_captions(text, dedupe=False):
+    # WebVTT or SRT into segments. YouTube's automatic captions roll: every cue repeats the line before it,
+    # so with dedupe only lines that were not in the previous cue are kept.
+    segments = []
+    previous_lines = []
+    # Cues are separated by empty lines; YouTube puts whitespace-only lines inside cues, so those do not count
+    for block in re.split(r'\n\n+', text.replace('\r\n', '\n')):
+        lines = block.strip().split('\n')
+        timing = next((i for i, line in enumerate(lines) if '-->' in line), None)
+        if timing is None:
+            continue
+        start_text, end_text = [part.strip().split(' ')[0] for part in lines[timing].split('-->')]
+        start, end = parse_timestamp(start_text), parse_timestamp(end_text)
+        cleaned = [html.unescape(TAG.sub('', line)).strip() for line in lines[timing + 1:]]
+        cleaned = [line for line in cleaned if line]
+        new_lines = [line for line in cleaned if line not in previous_lines] if dedupe else cleaned
+        previous_lines = cleaned
+        if new_lines and end > start:
+            # Leading space to match the text of Whisper segments
+            segments.append(ChunkSegment(start, end, " " + " ".join(new_lines), 0.0, 0.0, 0.0))
+    return segments
+
+def load_caption_file(path, dedupe=False):
+    with open(path, 'r', encoding='utf-8') as f:
+        return parse_captions(f.read(), dedupe)
+
+def choose_caption_track(metadata, policy=CAPTION_POLICY, languages=CAPTION_LANGUAGES):
+    # Returns (kind, language, track) for the first acceptable WebVTT track, manual subtitles before automatic ones
+    if policy == "off":
+        return None
+    kinds = [("manual", "subtitles")] + ([("auto", "automatic_captions")] if policy == "auto" else [])
+    for kind, field in kinds:
+        tracks = metadata.get(field) or {}
+        for language in languages:
+            for track in tracks.get(language, []):
+                if track["ext"] == "vtt" and track.get("url"):
+                    return kind, language, track
+    return None
+
+def fetch_captions(url):
+    with urllib.request.urlopen(url, timeout=30) as response:
+        return response.read().decode('utf-8')
+
+def transcribe_from_captions(url, output_file, mode='w', policy=CAPTION_POLICY, start=None, end=None, emit=print_event):
+    # Writes the transcript from existing captions and returns its source, or None when Whisper is needed
+    if policy == "off":
+        return None
+    metadata = probe_video(url)
+    choice = choose_caption_track(metadata, policy)
+    if choice is None:
+        logging.info(f"No usable captions for {metadata['id']} under policy '{policy}'")
+        return None
+    kind, language, track = choice
+    try:
+        text = fetch_captions(track["url"])
+    except OSError as e:
+        # Caption URLs expire, so one retry with a fresh probe
+        logging.info(f"Caption fetch failed ({str(e)}), probing {metadata['id']} again")
+        choice = choose_caption_track(probe_video(url, use_cache=False), policy)
+        if choice is None:
+            return None
+        kind, language, track = choice
+        try:
+            text = fetch_captions(track["url"])
+        except OSError as e:
+            logging.warning(f"Could not fetch captions for {metadata['id']}: {str(e)}")
+            return None
+
+    segments = [s for s in parse_captions(text, dedupe=kind == "auto")
+                if (start is None or s.end > start) and (end is None or s.start < end)]
+    if not segments:
+        return None
+    with SegmentSink(output_file, mode) as sink:
+        for segment in segments:
+            sink.write(segment)
+    source = {"source": "captions", "kind": kind, "language": language, "video_id": metadata["id"]}
+    record_transcript_source(output_file, source)
+    logging.info(f"Caption fast path: {len(segments)} segments from {kind} {language} captions of {metadata['id']}")
+    emit({"status": f"Used {kind} {language} captions, skipped download and transcription", "progress": 99, "transcript_source": source})
+    return source
\ No newline at end of file
@@ -0,0 +1,56 @@
+import hashlib
+import json
+import logging
+import os
+import time
+
+def checkpoint_path(output_file):
+    return f"{output_file}.checkpoint.json"
+
+def settings_key(model_path, compute_type, settings):
+    # Everything that changes the transcript besides the audio; a run with other settings must not append to it
+    params = {"model": os.path.normpath(model_path), "compute_type": compute_type, "settings": settings}
+    return hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+def load_checkpoint(output_file, audio_file, settings):
+    # Returns the saved checkpoint if it belongs to this audio file and these decode settings (a settings_key), and
+    # the transcript it describes is still on disk
+    path = checkpoint_path(output_file)
+    if not os.path.exists(path) or not os.path.exists(output_file):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        logging.warning(f"Ignoring unreadable checkpoint {path}: {str(e)}")
+        return None
+    if checkpoint.get("audio_file") != os.path.abspath(audio_file) or checkpoint.get("audio_size") != os.path.getsize(audio_file):
+        logging.info(f"Checkpoint {path} belongs to a different audio file, starting over")
+        return None
+    if checkpoint.get("settings") != settings:
+        logging.info(f"Checkpoint {path} was written with different decode settings, starting over")
+        return None
+    if os.path.getsize(output_file) < checkpoint["bytes"]:
+        logging.info(f"Transcript {output_file} is shorter than its checkpoint, starting over")
+        return None
+    return checkpoint
+
+def save_checkpoint(output_file, audio_file, settings, offset, bytes_written):
+    path = checkpoint_path(output_file)
+    checkpoint = {
+        "audio_file": os.path.abspath(audio_file),
+        "audio_size": os.path.getsize(audio_file),
+        "settings": settings,
+        "offset": offset,
+        "bytes": bytes_written,
+        "updated": time.time(),
+    }
+    # Write to a temporary file first so a crash mid-write never leaves a corrupt checkpoint
+    with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f)
+    os.replace(f"{path}.tmp", path)
+
+def remove_checkpoint(output_file):
+    path = checkpoint_path(output_file)
+    if os.path.exists(path):
+        os.remove(path)
\ No newline at end of file
@@ -0,0 +1,67 @@
+import json
+import logging
+import os
+import ctranslate2
+from config import DEVICE_PROBE_CACHE
+
+# Compute types in order of preference for each device
+PREFERRED_COMPUTE_TYPES = {
+    "cuda": ["float16", "int8_float16", "bfloat16", "int8", "float32"],
+    "cpu": ["int8_float32", "int8", "float32"],
+}
+
+def _probe_key():
+    # Re-probe whenever CTranslate2 is upgraded or the visible GPUs change
+    return f"{ctranslate2.__version__}|{os.environ.get('CUDA_VISIBLE_DEVICES', '')}"
+
+def probe_devices(cache_file=DEVICE_PROBE_CACHE):
+    if os.path.exists(cache_file):
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                probe = json.load(f)
+            if probe.get("key") == _probe_key():
+                return probe
+        except (OSError, json.JSONDecodeError) as e:
+            logging.warning(f"Ignoring unreadable device probe cache {cache_file}: {str(e)}")
+
+    cuda_devices = ctranslate2.get_cuda_device_count()
+    probe = {
+        "key": _probe_key(),
+        "cuda_devices": cuda_devices,
+        "cpu": sorted(ctranslate2.get_supported_compute_types("cpu")),
+        "cuda": sorted(ctranslate2.get_supported_compute_types("cuda")) if cuda_devices else [],
+    }
+    logging.info(f"Probed CTranslate2 devices: {probe}")
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            json.dump(probe, f)
+    except OSError as e:
+        logging.warning(f"Could not write device probe cache {cache_file}: {str(e)}")
+    return probe
+
+def resolve_device(device="auto", compute_type="auto"):
+    probe = probe_devices()
+
+    if device == "auto":
+        device = "cuda" if probe["cuda_devices"] else "cpu"
+        reason = f"{probe['cuda_devices']} CUDA device(s) found" if probe["cuda_devices"] else "no CUDA device found"
+    elif device == "cuda" and not probe["cuda_devices"]:
+        logging.warning("CUDA was requested but no CUDA device is available, falling back to CPU")
+        device = "cpu"
+        reason = "CUDA requested but unavailable"
+    else:
+        reason = "device requested explicitly"
+
+    supported = probe[device]
+    if compute_type != "auto" and compute_type not in supported:
+        logging.warning(f"Compute type {compute_type} is not supported on {device} (supported: {supported}), choosing automatically")
+        compute_type = "auto"
+    if compute_type == "auto":
+        compute_type = next((c for c in PREFERRED_COMPUTE_TYPES[device] if c in supported), "default")
+        reason += f", {compute_type} is the fastest supported compute type"
+    else:
+        reason += f", compute type {compute_type} requested explicitly"
+
+    logging.info(f"Using device={device}, compute_type={compute_type} ({reason})")
+    return device, compute_type
\ No newline at end of file
@@ -0,0 +1,7 @@
+import json
+import sys
+
+# Kept free of model imports so light modules (captions, the client) can report progress without loading faster_whisper
+def print_event(event):
+    print(json.dumps(event))
+    sys.stdout.flush()
@@ -0,0 +1,16 @@
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from config import JOB_SCRATCH_DIR
+
+@contextmanager
+def job_directory(prefix="job-"):
+    # A private scratch directory for one job, removed with whatever is left in it when the job ends.
+    # Concurrent jobs never see each other's partial files.
+    os.makedirs(JOB_SCRATCH_DIR, exist_ok=True)
+    path = tempfile.mkdtemp(prefix=prefix, dir=JOB_SCRATCH_DIR)
+    try:
+        yield path
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
\ No newline at end of file
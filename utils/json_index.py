@@ -0,0 +1,99 @@
+import copy
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+@contextmanager
+def file_lock(path):
+    # Exclusive lock shared by every process that opens the same lock file
+    with open(path, 'a+b') as f:
+        if os.name == "nt":
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gives up after about ten seconds; keep waiting for the other process
+                    time.sleep(0.1)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+class JsonIndex:
+    # A JSON file that several processes (server, job processes, the GUI) read and change. Lookups use an
+    # in-memory copy that is only re-read when another process has replaced the file. Changes are made under a
+    # file lock on a freshly read copy and written to a unique temporary file that atomically replaces the index.
+    def __init__(self, path, default):
+        self.path = path
+        self.default = default
+        self._data = None
+        self._stamp = None
+        self._lock = threading.Lock()
+
+    def _file_stamp(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        # Every write replaces the file, so the inode changes even when size and mtime happen to match
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _load(self):
+        stamp = self._file_stamp()
+        if self._data is None or stamp != self._stamp:
+            data = copy.deepcopy(self.default)
+            if stamp is not None:
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        data.update(json.load(f))
+                except (OSError, json.JSONDecodeError) as e:
+                    logging.warning(f"Ignoring unreadable index {self.path}: {str(e)}")
+            self._data, self._stamp = data, stamp
+        return self._data
+
+    def read(self):
+        # The current index; treat it as read-only and change it through update()
+        with self._lock:
+            if self._data is not None and self._file_stamp() == self._stamp:
+                return self._data
+            if not os.path.exists(self.path):
+                return self._load()
+            # Windows cannot replace a file another process has open, so it is only opened under the writers' lock
+            with file_lock(f"{self.path}.lock"):
+                return self._load()
+
+    @contextmanager
+    def update(self):
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        with self._lock, file_lock(f"{self.path}.lock"):
+            data = self._load()
+            try:
+                yield data
+            except BaseException:
+                # The in-memory copy may be half changed; read the file again next time
+                self._data = None
+                raise
+            fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(self.path), suffix=".tmp", dir=directory)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+            self._stamp = self._file_stamp()
\ No newline at end of file
@@ -0,0 +1,172 @@
+import logging
+import os
+import subprocess
+import threading
+import time
+import numpy as np
+from config import LIVE_MAX_LAG_SECONDS, LIVE_WINDOW_SECONDS, LIVE_STEP_SECONDS, LIVE_HOLDBACK_SECONDS, LIVE_FALLBACK_MODELS
+from utils.audio_util import SAMPLE_RATE
+from utils.device_util import resolve_device
+from utils.events import print_event
+from utils.model_convert import resolve_model_path
+from utils.segment_sink import SegmentSink
+from utils.segment_util import shift_segments
+from utils.streaming import open_audio_stream, read_pcm
+from utils.transcription_service import get_service
+from utils.transcript_source import record_transcript_source
+
+def open_live_source(source, replay=False):
+    # URLs go through yt-dlp; local files and named pipes are decoded by ffmpeg directly.
+    # replay reads a finished file at real-time speed, otherwise a regular file is followed as it grows.
+    if not os.path.exists(source):
+        return open_audio_stream(source)
+    command = ["ffmpeg", "-loglevel", "error"]
+    if replay:
+        command += ["-re", "-i", source]
+    elif os.path.isfile(source):
+        command += ["-follow", "1", "-i", f"file:{source}"]
+    else:
+        command += ["-i", source]
+    command += ["-f", "f32le", "-ac", "1", "-ar", str(SAMPLE_RATE), "pipe:1"]
+    return (subprocess.Popen(command, stdout=subprocess.PIPE),)
+
+def live_tiers(model_path, fallback_models=LIVE_FALLBACK_MODELS):
+    # (model, beam_size) from most to least accurate
+    return [(model_path, 5), (model_path, 1)] + [(model, 1) for model in fallback_models]
+
+class LiveAudioBuffer:
+    # Reads PCM on a background thread so audio keeps arriving while the model is busy decoding
+    def __init__(self, stream, chunk_seconds=0.1):
+        self._chunks = []
+        self._lock = threading.Lock()
+        self.samples_received = 0
+        self.started = None
+        self.ended = threading.Event()
+        self._thread = threading.Thread(target=self._read, args=(stream, chunk_seconds), daemon=True)
+        self._thread.start()
+
+    def _read(self, stream, chunk_seconds):
+        try:
+            for chunk in read_pcm(stream, chunk_seconds):
+                with self._lock:
+                    if self.started is None:
+                        self.started = time.time() - len(chunk) / SAMPLE_RATE
+                    self._chunks.append(chunk)
+                    self.samples_received += len(chunk)
+        finally:
+            self.ended.set()
+
+    def take(self):
+        with self._lock:
+            chunks, self._chunks = self._chunks, []
+        return np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.float32)
+
+    @property
+    def received_seconds(self):
+        return self.samples_received / SAMPLE_RATE
+
+    @property
+    def live_seconds(self):
+        # Where the live edge is: the audio a real-time source would have delivered by now. Files followed with
+        # -follow start with their existing content and pipes deliver in bursts, so more than that may have arrived.
+        if self.started is None:
+            return 0.0
+        return min(self.received_seconds, time.time() - self.started)
+
+def transcribe_live(source, model_path, device, output_file, max_lag=LIVE_MAX_LAG_SECONDS, replay=False, compute_type="auto",
+                    fallback_models=LIVE_FALLBACK_MODELS, emit=print_event):
+    device, compute_type = resolve_device(device, compute_type)
+    tiers = live_tiers(model_path, fallback_models)
+    tier = 0
+    fast_decodes = 0
+    stats = {"segments": 0, "max_lag": 0.0, "tier_changes": 0, "skipped_seconds": 0.0}
+    processes = open_live_source(source, replay)
+    buffer = LiveAudioBuffer(processes[-1].stdout)
+    # window holds the audio that has not been written to the transcript yet; window_start is its absolute time
+    window = np.zeros(0, dtype=np.float32)
+    window_start = 0.0
+    pending = 0
+    previous_text = ""
+    emit({"status": f"Live transcription of {source}, at most {max_lag}s behind"})
+
+    try:
+        with SegmentSink(output_file, 'w') as sink:
+            while True:
+                ended = buffer.ended.is_set()
+                new_audio = buffer.take()
+                window = np.concatenate([window, new_audio])
+                pending += len(new_audio)
+                if not ended and pending < LIVE_STEP_SECONDS * SAMPLE_RATE:
+                    time.sleep(0.05)
+                    continue
+                if ended and not len(window):
+                    break
+                pending = 0
+
+                # Even the smallest tier could not keep up: skip the oldest audio rather than fall further behind.
+                # Only while the source is live and decoding trails real time, audio that merely arrived faster than
+                # real time is all transcribed.
+                behind = buffer.live_seconds - window_start
+                if not ended and behind > LIVE_WINDOW_SECONDS and len(window) > LIVE_WINDOW_SECONDS * SAMPLE_RATE:
+                    skipped = min(len(window) - int(LIVE_WINDOW_SECONDS * SAMPLE_RATE), int((behind - LIVE_WINDOW_SECONDS) * SAMPLE_RATE))
+                    window = window[skipped:]
+                    window_start += skipped / SAMPLE_RATE
+                    stats["skipped_seconds"] += skipped / SAMPLE_RATE
+                    logging.warning(f"Live: skipped {skipped / SAMPLE_RATE:.1f}s of audio to catch up")
+                    emit({"status": f"Falling behind live, skipped {skipped / SAMPLE_RATE:.1f}s of audio"})
+
+                model_name, beam_size = tiers[tier]
+                model = get_service(resolve_model_path(model_name, device, compute_type), device, compute_type)
+                decode_start = time.time()
+                segments, _ = model.transcribe(window, beam_size=beam_size, language="en", condition_on_previous_text=False,
+                                               initial_prompt=previous_text[-200:] or None)
+                segments = list(segments)
+                decode_seconds = time.time() - decode_start
+                window_seconds = len(window) / SAMPLE_RATE
+
+                # Segments ending well before the edge of the window will not change with more audio. Once the oldest
+                # unwritten audio would exceed the lag budget by the next decode, everything decoded so far is written.
+                force = ended or buffer.received_seconds - window_start + decode_seconds >= max_lag
+                final = segments if force else [s for s in segments if s.end <= window_seconds - LIVE_HOLDBACK_SECONDS]
+                # Lag behind the live edge, not behind audio that arrived early
+                lag = max(buffer.live_seconds - window_start, 0.0)
+                if final:
+                    for segment in shift_segments(final, window_start):
+                        sink.write(segment)
+                        previous_text += segment.text
+                    sink.flush()
+                    stats["segments"] += len(final)
+                    stats["max_lag"] = max(stats["max_lag"], lag)
+                    emit({"status": f"Live: {window_start + final[-1].end:.2f}s transcribed, {lag:.1f}s behind", "lag": round(lag, 2)})
+                cut = window_seconds if force else (final[-1].end if final else 0.0)
+                if not final and window_seconds > max_lag:
+                    # Nothing was said; keep only the tail that may hold the start of the next segment
+                    cut = window_seconds - LIVE_HOLDBACK_SECONDS
+                window = window[int(cut * SAMPLE_RATE):]
+                window_start += cut
+
+                # Fall back to a cheaper tier when over budget, return to a better one after a run of comfortable decodes
+                if lag > max_lag and tier < len(tiers) - 1:
+                    tier += 1
+                    fast_decodes = 0
+                    stats["tier_changes"] += 1
+                    logging.info(f"Live: {lag:.1f}s behind, switching to {tiers[tier][0]} with beam size {tiers[tier][1]}")
+                    emit({"status": f"Falling behind, switching to {tiers[tier][0]} (beam size {tiers[tier][1]})"})
+                elif lag < max_lag / 2 and tier > 0:
+                    fast_decodes += 1
+                    if fast_decodes >= 20:
+                        tier -= 1
+                        fast_decodes = 0
+                        stats["tier_changes"] += 1
+                        logging.info(f"Live: keeping up, switching back to {tiers[tier][0]} with beam size {tiers[tier][1]}")
+                else:
+                    fast_decodes = 0
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait()
+
+    record_transcript_source(output_file, {"source": "whisper", "model": model_path, "mode": "live", "fallback_models": fallback_models, "live": stats})
+    logging.info(f"Live transcription stats: {stats}")
+    emit({"status": f"Live transcription ended after {buffer.received_seconds:.1f}s, at most {stats['max_lag']:.1f}s behind", "live": stats})
+    return stats
\ No newline at end of file
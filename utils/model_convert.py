@@ -0,0 +1,90 @@
+import json
+import logging
+import os
+import re
+import shutil
+import time
+import ctranslate2
+from config import CONVERTED_MODEL_DIR
+from utils.model_pool import estimate_model_size
+
+QUANTIZATIONS = ["int8", "int8_float32", "int8_float16", "float16", "float32"]
+
+def manifest_path():
+    return os.path.join(CONVERTED_MODEL_DIR, "manifest.json")
+
+def load_manifest():
+    if not os.path.exists(manifest_path()):
+        return []
+    try:
+        with open(manifest_path(), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        logging.warning(f"Ignoring unreadable converted model manifest: {str(e)}")
+        return []
+
+def save_manifest(entries):
+    os.makedirs(CONVERTED_MODEL_DIR, exist_ok=True)
+    with open(f"{manifest_path()}.tmp", 'w', encoding='utf-8') as f:
+        json.dump(entries, f, indent=2)
+    os.replace(f"{manifest_path()}.tmp", manifest_path())
+
+def converted_model_dir(source, quantization):
+    # One directory per source, quantization and CTranslate2 version, so upgrades never load a stale conversion
+    name = re.sub(r"[^\w.-]", "_", source.strip("/\\"))
+    return os.path.join(CONVERTED_MODEL_DIR, name, quantization, f"ct2-{ctranslate2.__version__}")
+
+def convert_model(source, quantization, alias=None):
+    # source is a Transformers Whisper checkpoint (hub id or local directory); CTranslate2 cannot re-quantize its own format
+    from ctranslate2.converters import TransformersConverter
+    output_dir = converted_model_dir(source, quantization)
+    tmp_dir = f"{output_dir}.tmp"
+    if os.path.exists(tmp_dir):
+        shutil.rmtree(tmp_dir)
+    logging.info(f"Converting {source} to CTranslate2 {quantization} in {output_dir}")
+    start_time = time.time()
+    converter = TransformersConverter(source, copy_files=["tokenizer.json", "preprocessor_config.json"])
+    converter.convert(tmp_dir, quantization=quantization, force=True)
+    if os.path.exists(output_dir):
+        shutil.rmtree(output_dir)
+    os.replace(tmp_dir, output_dir)
+
+    entries = [e for e in load_manifest() if e["path"] != output_dir]
+    entries.append({
+        "source": source,
+        "alias": alias,
+        "quantization": quantization,
+        "path": output_dir,
+        "ctranslate2_version": ctranslate2.__version__,
+        "size": estimate_model_size(output_dir),
+        "created": time.time(),
+    })
+    save_manifest(entries)
+    logging.info(f"Converted {source} to {quantization} in {time.time() - start_time:.1f} seconds")
+    return output_dir
+
+def weight_type(compute_type):
+    # What a conversion or compute type stores its weights as: int8 weights serve every int8_* compute type,
+    # which only differ in the precision of the layers that are not quantized
+    if compute_type.startswith("int8"):
+        return "int8"
+    return compute_type if compute_type in ("float16", "bfloat16", "float32") else None
+
+def find_converted_model(model_path, device, compute_type):
+    # Returns a converted model whose weights are in the resolved compute type's precision, or None to use model_path
+    # as is. CTranslate2 would otherwise run e.g. an int8 conversion on cuda with float16 requested, without saying so.
+    candidates = [e for e in load_manifest()
+                  if model_path in (e["source"], e["alias"])
+                  and weight_type(e["quantization"]) is not None
+                  and weight_type(e["quantization"]) == weight_type(compute_type)
+                  and e["ctranslate2_version"] == ctranslate2.__version__
+                  and os.path.isdir(e["path"])]
+    if not candidates:
+        return None
+    # An exact match first, then the newest conversion
+    best = max(candidates, key=lambda e: (e["quantization"] == compute_type, e["created"]))
+    logging.info(f"Using converted {best['quantization']} model {best['path']} for {model_path} on {device} ({compute_type})")
+    return best["path"]
+
+def resolve_model_path(model_path, device, compute_type):
+    return find_converted_model(model_path, device, compute_type) or model_path
\ No newline at end of file
@@ -0,0 +1,98 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from faster_whisper import WhisperModel
+from config import MODEL_POOL_MAX_MODELS, MODEL_POOL_MEMORY_BUDGET_MB
+
+# Approximate weight sizes (MB) for models referenced by name instead of a local directory
+NAMED_MODEL_SIZES_MB = {
+    "tiny": 75,
+    "base": 145,
+    "small": 485,
+    "medium": 1530,
+    "large-v1": 3090,
+    "large-v2": 3090,
+    "large-v3": 3090,
+    "distil-large-v3": 1510,
+}
+
+def estimate_model_size(model_path):
+    if os.path.isdir(model_path):
+        total = 0
+        for root, _, files in os.walk(model_path):
+            for name in files:
+                total += os.path.getsize(os.path.join(root, name))
+        return total
+    return NAMED_MODEL_SIZES_MB.get(os.path.basename(model_path), 0) * 1024 * 1024
+
+class ModelPool:
+    def __init__(self, max_models=MODEL_POOL_MAX_MODELS, memory_budget_mb=MODEL_POOL_MEMORY_BUDGET_MB):
+        self.max_models = max_models
+        self.memory_budget = memory_budget_mb * 1024 * 1024
+        self._lock = threading.Lock()
+        self._models = OrderedDict()  # key -> (model, size in bytes), least recently used first
+        self._loading = {}  # key -> threading.Event set once the load finishes
+        self._stats = {"hits": 0, "misses": 0, "loads": 0, "evictions": 0, "load_time": 0.0}
+
+    def get(self, model_path, device, compute_type="float16", cpu_threads=0, num_workers=1):
+        key = (model_path, device, compute_type, cpu_threads, num_workers)
+        while True:
+            with self._lock:
+                if key in self._models:
+                    self._models.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return self._models[key][0]
+                pending = self._loading.get(key)
+                if pending is None:
+                    self._stats["misses"] += 1
+                    self._loading[key] = threading.Event()
+                    break
+            # Another thread is already loading this model, wait for it instead of loading a second copy
+            pending.wait()
+
+        try:
+            logging.info(f"Model pool: loading {model_path} (device={device}, compute_type={compute_type}, cpu_threads={cpu_threads}, num_workers={num_workers})")
+            start_time = time.time()
+            model = WhisperModel(model_path, device=device, compute_type=compute_type, cpu_threads=cpu_threads, num_workers=num_workers)
+            load_time = time.time() - start_time
+            size = estimate_model_size(model_path)
+            logging.info(f"Model pool: loaded {model_path} in {load_time:.2f} seconds ({size / (1024 * 1024):.0f} MB)")
+            with self._lock:
+                self._models[key] = (model, size)
+                self._stats["loads"] += 1
+                self._stats["load_time"] += load_time
+                self._evict(keep=key)
+            return model
+        finally:
+            with self._lock:
+                self._loading.pop(key).set()
+
+    def _evict(self, keep):
+        while len(self._models) > 1 and (len(self._models) > self.max_models or self._total_size() > self.memory_budget):
+            key = next(iter(self._models))
+            if key == keep:
+                break
+            self._models.pop(key)
+            self._stats["evictions"] += 1
+            logging.info(f"Model pool: evicted {key[0]} (device={key[1]}, compute_type={key[2]})")
+
+    def _total_size(self):
+        return sum(size for _, size in self._models.values())
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["models"] = len(self._models)
+            stats["memory_mb"] = round(self._total_size() / (1024 * 1024), 1)
+        return stats
+
+model_pool = ModelPool()
+
+def get_model(model_path, device, compute_type="float16", cpu_threads=0, num_workers=1):
+    return model_pool.get(model_path, device, compute_type, cpu_threads, num_workers)
@@ -0,0 +1,67 @@
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from utils.audio_util import SAMPLE_RATE, load_audio, split_audio
+from utils.model_pool import get_model
+from utils.segment_util import shift_segments
+
+class ParallelInfo:
+    def __init__(self, language, duration):
+        self.language = language
+        self.language_probability = 1.0
+        self.duration = duration
+        # Filled in as chunks complete
+        self.duration_after_vad = 0.0
+
+# Pools stay alive between calls so workers keep their models loaded
+_executors = {}
+
+def _init_worker(model_path, compute_type, cpu_threads):
+    get_model(model_path, "cpu", compute_type, cpu_threads)
+
+def _transcribe_chunk(model_path, compute_type, cpu_threads, offset, chunk, options):
+    model = get_model(model_path, "cpu", compute_type, cpu_threads)
+    segments, info = model.transcribe(chunk, **options)
+    return list(shift_segments(segments, offset)), info.duration_after_vad
+
+def get_executor(model_path, compute_type, num_processes):
+    cpu_threads = max(1, (os.cpu_count() or 1) // num_processes)
+    key = (model_path, compute_type, num_processes)
+    if key not in _executors:
+        logging.info(f"Starting {num_processes} transcription processes with {cpu_threads} CPU threads each")
+        _executors[key] = ProcessPoolExecutor(
+            max_workers=num_processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(model_path, compute_type, cpu_threads),
+        )
+    return _executors[key], cpu_threads
+
+def shutdown_executors():
+    for executor in _executors.values():
+        executor.shutdown()
+    _executors.clear()
+
+def transcribe_parallel(audio, model_path, compute_type, num_processes, chunk_seconds, **options):
+    audio = load_audio(audio)
+    duration = len(audio) / SAMPLE_RATE
+    # At least one chunk per process, and chunks no longer than chunk_seconds
+    chunk_seconds = min(chunk_seconds, max(duration / num_processes, 30))
+    chunks = list(split_audio(audio, chunk_seconds))
+    logging.info(f"Split {duration:.1f}s of audio into {len(chunks)} chunks for {num_processes} processes")
+
+    executor, cpu_threads = get_executor(model_path, compute_type, num_processes)
+    futures = [executor.submit(_transcribe_chunk, model_path, compute_type, cpu_threads, offset, chunk, options)
+               for offset, chunk in chunks]
+
+    info = ParallelInfo(options.get("language"), duration)
+
+    def segments():
+        # Chunks finish out of order; yield them in time order so the output matches the sequential path
+        for future in futures:
+            chunk_segments, duration_after_vad = future.result()
+            info.duration_after_vad += duration_after_vad
+            yield from chunk_segments
+
+    return segments(), info
\ No newline at end of file
@@ -0,0 +1,36 @@
+from config import DEFAULT_PRESET, VAD_FILTER
+
+# Named bundles of decoding settings, from highest throughput to highest accuracy.
+# Measure them on your own audio with benchmarks/bench_presets.py.
+PRESETS = {
+    "fast": {
+        "beam_size": 1,
+        "best_of": 1,
+        "temperature": (0.0, 0.4, 0.8),
+        "condition_on_previous_text": False,
+        "vad_filter": True,
+        "batch_size": 16,
+    },
+    "balanced": {
+        "beam_size": 3,
+        "best_of": 3,
+        "temperature": (0.0, 0.2, 0.4, 0.6, 0.8, 1.0),
+        "condition_on_previous_text": True,
+        "vad_filter": True,
+        "batch_size": None,
+    },
+    "accurate": {
+        "beam_size": 5,
+        "best_of": 5,
+        "temperature": (0.0, 0.2, 0.4, 0.6, 0.8, 1.0),
+        "condition_on_previous_text": True,
+        "vad_filter": VAD_FILTER,
+        "batch_size": None,
+    },
+}
+
+def get_preset(name=None):
+    name = name or DEFAULT_PRESET
+    if name not in PRESETS:
+        raise ValueError(f"Unknown preset '{name}', choose one of: {', '.join(PRESETS)}")
+    return PRESETS[name]
\ No newline at end of file
@@ -0,0 +1,104 @@
+import logging
+import re
+import time
+from collections import Counter
+from config import REPETITION_MAX_REPEATS, REPETITION_NGRAM_SIZE, REPETITION_REDECODE_SECONDS, REPETITION_REDECODE_TEMPERATURE
+from utils.audio_util import SAMPLE_RATE, load_audio
+from utils.segment_util import shift_segments
+
+def normalize_text(text):
+    return re.sub(r"[^\w\s']", "", text.lower()).split()
+
+def has_ngram_loop(words, ngram_size, max_repeats):
+    # True when a single n-gram repeats max_repeats times and makes up at least half of the line
+    if len(words) < ngram_size * max_repeats:
+        return False
+    ngrams = Counter(tuple(words[i:i + ngram_size]) for i in range(len(words) - ngram_size + 1))
+    count = ngrams.most_common(1)[0][1]
+    return count >= max_repeats and count * ngram_size * 2 >= len(words)
+
+class RepetitionDetector:
+    def __init__(self, max_repeats=REPETITION_MAX_REPEATS, ngram_size=REPETITION_NGRAM_SIZE):
+        self.max_repeats = max_repeats
+        self.ngram_size = ngram_size
+        self.reset()
+
+    def reset(self):
+        self.last_words = None
+        # Consecutive copies of the last line, held back until we know whether they are a loop
+        self.pending = []
+        self.pending_since = time.time()
+        self.loop_start = None
+        self.loop_audio = 0.0
+        self.loop_decode_time = 0.0
+        self.discarded = []
+
+    def push(self, segment):
+        # Returns the segments that are safe to write; sets loop_start when a loop is detected
+        words = normalize_text(segment.text)
+        if has_ngram_loop(words, self.ngram_size, self.max_repeats):
+            self._fire(self.pending + [segment])
+            return []
+        if len(words) >= self.ngram_size and words == self.last_words:
+            self.pending.append(segment)
+            if len(self.pending) + 1 >= self.max_repeats:
+                self._fire(self.pending)
+            return []
+        released = self.pending + [segment]
+        self.pending = []
+        self.pending_since = time.time()
+        self.last_words = words
+        return released
+
+    def flush(self):
+        released = self.pending
+        self.pending = []
+        return released
+
+    def _fire(self, discarded):
+        self.discarded = discarded
+        self.loop_start = discarded[0].start
+        self.loop_audio = discarded[-1].end - discarded[0].start
+        self.loop_decode_time = time.time() - self.pending_since
+
+def guard_repetitions(model, audio, segments, options, stats):
+    # Passes segments through, but when the decoder gets stuck repeating itself the stream is cut off,
+    # the looping window is re-decoded without conditioning on previous text, and decoding resumes after it
+    detector = RepetitionDetector()
+    decoded = None
+    while True:
+        for segment in segments:
+            yield from detector.push(segment)
+            if detector.loop_start is not None:
+                break
+        else:
+            yield from detector.flush()
+            return
+
+        loop_start = detector.loop_start
+        stats["loops_detected"] += 1
+        stats["segments_discarded"] += len(detector.discarded)
+        logging.warning(f"Repetition loop detected at {loop_start:.2f}s: {detector.discarded[0].text.strip()!r} x{len(detector.discarded)}")
+
+        if decoded is None:
+            decoded = load_audio(audio)
+        window_end = min(loop_start + REPETITION_REDECODE_SECONDS, len(decoded) / SAMPLE_RATE)
+        redecode_start_time = time.time()
+        window = decoded[int(loop_start * SAMPLE_RATE):int(window_end * SAMPLE_RATE)]
+        redecoded, _ = model.transcribe(window, **dict(options, condition_on_previous_text=False, temperature=REPETITION_REDECODE_TEMPERATURE))
+        redecoded = list(shift_segments(redecoded, loop_start))
+        redecode_time = time.time() - redecode_start_time
+        stats["redecode_seconds"] += redecode_time
+
+        # Had the loop continued at the rate it was decoding, the window would have cost this much
+        if detector.loop_audio > 0:
+            loop_rate = detector.loop_decode_time / detector.loop_audio
+            stats["decode_seconds_saved"] += max(0.0, loop_rate * (window_end - loop_start) - redecode_time)
+
+        yield from redecoded
+        resume_at = max(redecoded[-1].end if redecoded else window_end, loop_start + 1)
+        if resume_at >= len(decoded) / SAMPLE_RATE:
+            return
+        detector.reset()
+        resumed, _ = model.transcribe(decoded[int(resume_at * SAMPLE_RATE):], **options)
+        segments = shift_segments(resumed, resume_at)
\ No newline at end of file
@@ -0,0 +1,75 @@
+import os
+import time
+from config import SINK_FLUSH_SECONDS, SINK_FLUSH_BYTES, SINK_FLUSH_SEGMENTS, PROGRESS_MAX_RATE_HZ
+from utils.segment_util import format_segment
+
+class SegmentSink:
+    # Buffers transcript lines and writes them in one go once enough time, bytes or segments have piled up
+    def __init__(self, output_file, mode='w', flush_seconds=SINK_FLUSH_SECONDS, flush_bytes=SINK_FLUSH_BYTES, flush_segments=SINK_FLUSH_SEGMENTS):
+        # No newline translation: bytes_written has to match the file size exactly, since checkpoints truncate to it
+        self.file = open(output_file, mode, encoding='utf-8', newline='')
+        self.flush_seconds = flush_seconds
+        self.flush_bytes = flush_bytes
+        self.flush_segments = flush_segments
+        self.bytes_written = os.path.getsize(output_file)
+        self._buffer = []
+        self._buffered_bytes = 0
+        self._last_flush = time.time()
+
+    def write(self, segment):
+        line = format_segment(segment)
+        self._buffer.append(line)
+        self._buffered_bytes += len(line.encode('utf-8'))
+        if (self._buffered_bytes >= self.flush_bytes or len(self._buffer) >= self.flush_segments
+                or time.time() - self._last_flush >= self.flush_seconds):
+            self.flush()
+
+    def flush(self, fsync=False):
+        if self._buffer:
+            self.file.write("".join(self._buffer))
+            self.bytes_written += self._buffered_bytes
+            self._buffer = []
+            self._buffered_bytes = 0
+        self.file.flush()
+        if fsync:
+            os.fsync(self.file.fileno())
+        self._last_flush = time.time()
+
+    def close(self, fsync=False):
+        if not self.file.closed:
+            self.flush(fsync)
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+class ProgressThrottle:
+    # Passes status events straight through but coalesces progress events to at most max_rate_hz,
+    # keeping only the latest one that arrived in between
+    def __init__(self, emit, max_rate_hz=PROGRESS_MAX_RATE_HZ):
+        self.emit = emit
+        self.interval = 1.0 / max_rate_hz if max_rate_hz else 0.0
+        self._pending = None
+        self._last_emit = 0.0
+
+    def __call__(self, event):
+        if "progress" not in event:
+            self.flush()
+            self.emit(event)
+            return
+        now = time.time()
+        if now - self._last_emit >= self.interval:
+            self._pending = None
+            self._last_emit = now
+            self.emit(event)
+        else:
+            self._pending = event
+
+    def flush(self):
+        if self._pending is not None:
+            self.emit(self._pending)
+            self._pending = None
+            self._last_emit = time.time()
\ No newline at end of file
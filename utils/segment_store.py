@@ -0,0 +1,145 @@
+import json
+import mmap
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from utils.segment_util import ChunkSegment
+
+Word = namedtuple("Word", ["start", "end", "word", "probability"])
+
+MAGIC = b"YTSEG1\n\0"
+
+# (name, typecode) of every parallel array, in file order
+SECTIONS = [
+    ("start", "d"),
+    ("end", "d"),
+    ("avg_logprob", "f"),
+    ("compression_ratio", "f"),
+    ("no_speech_prob", "f"),
+    ("text_offsets", "Q"),      # count + 1 byte offsets into text
+    ("word_offsets", "Q"),      # count + 1 indexes into the word arrays
+    ("word_start", "d"),
+    ("word_end", "d"),
+    ("word_probability", "f"),
+    ("word_text_offsets", "Q"), # word count + 1 byte offsets into word_text
+    ("text", "B"),
+    ("word_text", "B"),
+]
+
+class SegmentStore:
+    # Segments and word timestamps kept in parallel typed arrays with all text in one UTF-8 buffer,
+    # instead of one Python object per segment and per word
+    def __init__(self):
+        for name, typecode in SECTIONS:
+            setattr(self, name, array(typecode))
+        self.text_offsets.append(0)
+        self.word_offsets.append(0)
+        self.word_text_offsets.append(0)
+        self._mmap = None
+
+    def __len__(self):
+        return len(self.start)
+
+    def append(self, segment):
+        self.start.append(segment.start)
+        self.end.append(segment.end)
+        self.avg_logprob.append(segment.avg_logprob)
+        self.compression_ratio.append(segment.compression_ratio)
+        self.no_speech_prob.append(segment.no_speech_prob)
+        self.text.frombytes(segment.text.encode('utf-8'))
+        self.text_offsets.append(len(self.text))
+        for word in getattr(segment, "words", None) or []:
+            self.word_start.append(word.start)
+            self.word_end.append(word.end)
+            self.word_probability.append(word.probability)
+            self.word_text.frombytes(word.word.encode('utf-8'))
+            self.word_text_offsets.append(len(self.word_text))
+        self.word_offsets.append(len(self.word_start))
+
+    def extend(self, segments):
+        for segment in segments:
+            self.append(segment)
+
+    def segment_text(self, index):
+        return bytes(self.text[self.text_offsets[index]:self.text_offsets[index + 1]]).decode('utf-8')
+
+    def __getitem__(self, index):
+        return ChunkSegment(self.start[index], self.end[index], self.segment_text(index),
+                            self.avg_logprob[index], self.compression_ratio[index], self.no_speech_prob[index])
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def words(self, index):
+        for w in range(self.word_offsets[index], self.word_offsets[index + 1]):
+            text = bytes(self.word_text[self.word_text_offsets[w]:self.word_text_offsets[w + 1]]).decode('utf-8')
+            yield Word(self.word_start[w], self.word_end[w], text, self.word_probability[w])
+
+    def time_range(self, start, end):
+        # Segments overlapping [start, end); segments are appended in time order so both bounds are binary searches
+        first = bisect_right(self.end, start)
+        last = bisect_left(self.start, end)
+        return SegmentView(self, first, max(first, last))
+
+    def nbytes(self):
+        return sum(getattr(self, name).itemsize * len(getattr(self, name)) for name, _ in SECTIONS)
+
+    def save(self, path):
+        header = json.dumps({"count": len(self), "sections": [[name, typecode, len(getattr(self, name))] for name, typecode in SECTIONS]}).encode('utf-8')
+        with open(path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<Q", len(header)))
+            f.write(header)
+            for name, _ in SECTIONS:
+                # Keep every section 8-byte aligned so it can be cast in place after mmap
+                f.write(b"\0" * (-f.tell() % 8))
+                f.write(memoryview(getattr(self, name)).cast('B'))
+
+    @classmethod
+    def load(cls, path):
+        # Memory-maps the file; the arrays are views into the mapping, nothing is copied until it is read
+        store = cls.__new__(cls)
+        with open(path, 'rb') as f:
+            store._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(store._mmap)
+        if bytes(view[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f"{path} is not a segment store")
+        header_length = struct.unpack("<Q", view[len(MAGIC):len(MAGIC) + 8])[0]
+        position = len(MAGIC) + 8
+        header = json.loads(bytes(view[position:position + header_length]))
+        position += header_length
+        for name, typecode, length in header["sections"]:
+            position += -position % 8
+            size = array(typecode).itemsize * length
+            setattr(store, name, view[position:position + size].cast(typecode))
+            position += size
+        return store
+
+class SegmentView:
+    # A time slice of a SegmentStore; indexes into the parent arrays without copying them
+    def __init__(self, store, first, last):
+        self.store = store
+        self.first = first
+        self.last = last
+
+    def __len__(self):
+        return self.last - self.first
+
+    def __getitem__(self, index):
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self.store[self.first + index]
+
+    def __iter__(self):
+        for index in range(self.first, self.last):
+            yield self.store[index]
+
+    @property
+    def start(self):
+        return memoryview(self.store.start)[self.first:self.last]
+
+    @property
+    def end(self):
+        return memoryview(self.store.end)[self.first:self.last]
\ No newline at end of file
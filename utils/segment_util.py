@@ -0,0 +1,10 @@
+from collections import namedtuple
+
+ChunkSegment = namedtuple("ChunkSegment", ["start", "end", "text", "avg_logprob", "compression_ratio", "no_speech_prob"])
+
+def shift_segments(segments, offset):
+    for s in segments:
+        yield ChunkSegment(s.start + offset, s.end + offset, s.text, s.avg_logprob, s.compression_ratio, s.no_speech_prob)
+
+def format_segment(segment):
+    return f"[{segment.start:.2f}s -> {segment.end:.2f}s] {segment.text}\n"
\ No newline at end of file
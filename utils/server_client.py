@@ -0,0 +1,62 @@
+import json
+import os
+import socket
+from config import SERVER_ADDRESS
+
+def connect(address=SERVER_ADDRESS, timeout=None):
+    # address is a Unix socket path or a (host, port) pair
+    family = socket.AF_INET if isinstance(address, tuple) else socket.AF_UNIX
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(address)
+    except OSError:
+        sock.close()
+        raise
+    sock.settimeout(None)
+    return sock
+
+def server_available(address=SERVER_ADDRESS):
+    if not isinstance(address, tuple) and not os.path.exists(address):
+        return False
+    try:
+        connect(address, timeout=1).close()
+        return True
+    except OSError:
+        return False
+
+def send_request(request, address=SERVER_ADDRESS):
+    # Yields every JSON event the server streams back until it closes the connection
+    with connect(address) as sock:
+        sock.sendall((json.dumps(request) + "\n").encode('utf-8'))
+        with sock.makefile('r', encoding='utf-8') as reader:
+            for line in reader:
+                if line.strip():
+                    yield json.loads(line)
+
+def shutdown_server(address=SERVER_ADDRESS):
+    # The server stops once its running jobs are done
+    yield from send_request({"command": "shutdown"}, address)
+
+def preload_model(model_path, device, address=SERVER_ADDRESS):
+    yield from send_request({"command": "preload", "model_path": model_path, "device": device}, address)
+
+def submit_job(audio_file, model_path, device, output_file, api_key, preset=None, start=None, end=None, audio_start=0.0, url=None, caption_policy=None, stream=False, address=SERVER_ADDRESS):
+    # With a url and no audio_file the server tries the video's captions first (under caption_policy, or the
+    # server's CAPTION_POLICY when None) and downloads only if needed; with stream it transcribes while downloading
+    request = {
+        "command": "transcribe",
+        "audio_file": os.path.abspath(audio_file) if audio_file else "",
+        "url": url,
+        "model_path": model_path,
+        "device": device,
+        "output_file": os.path.abspath(output_file),
+        "api_key": api_key,
+        "preset": preset,
+        "start": start,
+        "end": end,
+        "audio_start": audio_start,
+        "caption_policy": caption_policy,
+        "stream": stream,
+    }
+    yield from send_request(request, address)
\ No newline at end of file
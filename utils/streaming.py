@@ -0,0 +1,104 @@
+import logging
+import subprocess
+import sys
+import time
+import numpy as np
+from config import STREAM_BLOCK_SECONDS
+from utils.audio_util import SAMPLE_RATE, find_quiet_point
+from utils.device_util import resolve_device
+from utils.events import print_event
+from utils.model_convert import resolve_model_path
+from utils.segment_sink import SegmentSink, ProgressThrottle
+from utils.segment_util import shift_segments
+from utils.transcription_service import get_service
+from utils.transcript_source import record_transcript_source
+from utils.transcription_util import decode_options
+
+def open_audio_stream(url, start=None, end=None):
+    # yt-dlp writes the audio stream to a pipe and ffmpeg turns it into 16 kHz mono float32 as it arrives
+    command = [sys.executable, "-m", "yt_dlp", "-f", "bestaudio/best", "--quiet", "--no-part", "-o", "-", url]
+    if start is not None or end is not None:
+        command[-1:-1] = ["--download-sections", f"*{start or 0}-{'inf' if end is None else end}"]
+    downloader = subprocess.Popen(command, stdout=subprocess.PIPE)
+    decoder = subprocess.Popen(["ffmpeg", "-loglevel", "error", "-i", "pipe:0", "-f", "f32le", "-ac", "1", "-ar", str(SAMPLE_RATE), "pipe:1"],
+                               stdin=downloader.stdout, stdout=subprocess.PIPE)
+    # Let ffmpeg own the pipe so yt-dlp gets SIGPIPE if ffmpeg exits early
+    downloader.stdout.close()
+    return downloader, decoder
+
+def read_pcm(stream, seconds=1.0):
+    # Yields float32 arrays of about `seconds` each until the stream ends
+    chunk_bytes = int(SAMPLE_RATE * seconds) * 4
+    leftover = b""
+    while True:
+        data = stream.read(chunk_bytes)
+        if not data:
+            break
+        data = leftover + data
+        usable = len(data) - len(data) % 4
+        leftover = data[usable:]
+        yield np.frombuffer(data[:usable], dtype=np.float32)
+
+def transcribe_stream(url, model_path, device, output_file, duration=None, mode='w', start=None, end=None, compute_type="auto", preset=None, block_seconds=STREAM_BLOCK_SECONDS, emit=print_event):
+    # Transcribes while the audio is still downloading: every time a block of audio has arrived it is cut at
+    # a quiet point and decoded, and the remainder is carried over into the next block
+    device, compute_type = resolve_device(device, compute_type)
+    model_path = resolve_model_path(model_path, device, compute_type)
+    model = get_service(model_path, device, compute_type)
+    options = decode_options(preset)
+    progress = ProgressThrottle(emit)
+    downloader, decoder = open_audio_stream(url, start, end)
+    start_time = time.time()
+    first_segment_time = None
+    buffer = np.zeros(0, dtype=np.float32)
+    # Timestamps stay absolute when only a section of the video is streamed
+    offset = start or 0.0
+    previous_text = ""
+
+    def decode(block, offset):
+        block_options = dict(options)
+        if options["condition_on_previous_text"] and previous_text:
+            block_options["initial_prompt"] = previous_text[-200:]
+        segments, _ = model.transcribe(block, **block_options)
+        return shift_segments(segments, offset)
+
+    emit({"status": "Streaming audio into the decoder"})
+    try:
+        with SegmentSink(output_file, mode) as sink:
+            pcm = read_pcm(decoder.stdout)
+            finished = False
+            while not finished:
+                try:
+                    buffer = np.concatenate([buffer, next(pcm)])
+                except StopIteration:
+                    finished = True
+                if not finished and len(buffer) < block_seconds * SAMPLE_RATE:
+                    continue
+                cut = len(buffer) if finished else find_quiet_point(buffer)
+                for segment in decode(buffer[:cut], offset):
+                    if first_segment_time is None:
+                        first_segment_time = time.time() - start_time
+                        logging.info(f"Streaming: first segment after {first_segment_time:.1f} seconds")
+                    sink.write(segment)
+                    previous_text += segment.text
+                    event = {"status": f"Transcribed segment: {segment.start:.2f}s -> {segment.end:.2f}s"}
+                    if duration:
+                        window = (end or duration) - (start or 0.0)
+                        event["progress"] = min(int(((segment.end - (start or 0.0)) / window) * 100), 99)
+                    progress(event)
+                offset += cut / SAMPLE_RATE
+                buffer = buffer[cut:]
+    finally:
+        decoder.stdout.close()
+        decoder.wait()
+        downloader.wait()
+    progress.flush()
+
+    if downloader.returncode:
+        raise RuntimeError(f"yt-dlp exited with code {downloader.returncode} while streaming {url}")
+    record_transcript_source(output_file, {"source": "whisper", "model": model_path, "preset": preset, "mode": "stream"})
+    elapsed = time.time() - start_time
+    streamed = offset - (start or 0.0)
+    logging.info(f"Streaming: transcribed {streamed:.1f}s of audio in {elapsed:.1f} seconds")
+    emit({"status": f"Streamed and transcribed {streamed:.1f}s of audio in {elapsed:.1f} seconds"})
+    return offset
\ No newline at end of file
@@ -0,0 +1,108 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import namedtuple
+import numpy as np
+from config import TRANSCRIPT_CACHE_DIR, TRANSCRIPT_CACHE_MAX_MB
+from utils.audio_util import load_audio
+from utils.json_index import JsonIndex
+from utils.segment_store import SegmentStore
+
+# Samples hashed per update() call when fingerprinting audio (4 MB of float32)
+HASH_CHUNK_SAMPLES = 1024 * 1024
+
+CachedInfo = namedtuple("CachedInfo", ["language", "language_probability", "duration", "duration_after_vad"])
+
+class TranscriptCache:
+    def __init__(self, cache_dir=TRANSCRIPT_CACHE_DIR, max_mb=TRANSCRIPT_CACHE_MAX_MB):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_mb * 1024 * 1024
+        self.index_file = os.path.join(cache_dir, "index.json")
+        # The server and job processes share this index, see JsonIndex
+        self._index = JsonIndex(self.index_file, {"entries": {}, "audio_hashes": {}, "hits": 0, "misses": 0})
+
+    def audio_fingerprint(self, audio_file):
+        # Hashes the decoded samples so the same audio under another name or container still matches.
+        # Hashes are remembered per (path, size, mtime); the decoded array is returned when we had to decode.
+        stat = os.stat(audio_file)
+        file_key = f"{os.path.abspath(audio_file)}|{stat.st_size}|{stat.st_mtime_ns}"
+        known = self._index.read()["audio_hashes"].get(file_key)
+        if known:
+            return known, None
+        audio = load_audio(audio_file)
+        # Hashed in chunks straight from the (usually memory-mapped) array instead of copying it with tobytes()
+        hasher = hashlib.sha256()
+        for i in range(0, len(audio), HASH_CHUNK_SAMPLES):
+            hasher.update(memoryview(np.ascontiguousarray(audio[i:i + HASH_CHUNK_SAMPLES])))
+        digest = hasher.hexdigest()
+        with self._index.update() as index:
+            index["audio_hashes"][file_key] = digest
+            self._prune_audio_hashes(index)
+        return digest, audio
+
+    def _prune_audio_hashes(self, index):
+        # Drop hashes of files that were deleted, moved or changed since, their keys can never match again
+        hashes = index["audio_hashes"]
+        for file_key in list(hashes):
+            path, size, mtime_ns = file_key.rsplit("|", 2)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                del hashes[file_key]
+                continue
+            if str(stat.st_size) != size or str(stat.st_mtime_ns) != mtime_ns:
+                del hashes[file_key]
+
+    def make_key(self, audio_hash, model_path, compute_type, options):
+        params = {"audio": audio_hash, "model": os.path.normpath(model_path), "compute_type": compute_type, "options": options}
+        return hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        path = os.path.join(self.cache_dir, f"{key}.seg")
+        with self._index.update() as index:
+            entry = index["entries"].get(key)
+            if entry is None or not os.path.exists(path):
+                index["misses"] += 1
+                return None
+            entry["last_access"] = time.time()
+            index["hits"] += 1
+            info = CachedInfo(**entry["info"])
+        return SegmentStore.load(path), info
+
+    def put(self, key, store, info):
+        # store is a SegmentStore, saved as is in its binary format
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = os.path.join(self.cache_dir, f"{key}.seg")
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        store.save(tmp_path)
+        os.replace(tmp_path, path)
+        with self._index.update() as index:
+            index["entries"][key] = {
+                "size": os.path.getsize(path),
+                "last_access": time.time(),
+                "info": {"language": info.language, "language_probability": info.language_probability,
+                         "duration": info.duration, "duration_after_vad": getattr(info, "duration_after_vad", info.duration)},
+            }
+            self._evict(index)
+
+    def _evict(self, index):
+        entries = index["entries"]
+        total = sum(entry["size"] for entry in entries.values())
+        for key in sorted(entries, key=lambda k: entries[k]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            total -= entries.pop(key)["size"]
+            path = os.path.join(self.cache_dir, f"{key}.seg")
+            if os.path.exists(path):
+                os.remove(path)
+            logging.info(f"Transcript cache: evicted {key}")
+
+    def stats(self):
+        index = self._index.read()
+        return {"hits": index["hits"], "misses": index["misses"], "entries": len(index["entries"]),
+                "size_mb": round(sum(e["size"] for e in index["entries"].values()) / (1024 * 1024), 2)}
+
+transcript_cache = TranscriptCache()
\ No newline at end of file
@@ -0,0 +1,23 @@
+import json
+import os
+import time
+
+def source_path(output_file):
+    return f"{output_file}.source.json"
+
+def record_transcript_source(output_file, source):
+    # Notes next to the transcript whether it came from captions or from a model, and which one
+    with open(source_path(output_file), 'w', encoding='utf-8') as f:
+        json.dump(dict(source, created=time.time()), f)
+
+def describe_transcript_source(source):
+    if source.get("source") == "captions":
+        return f"{source['kind']} {source['language']} captions of {source['video_id']}"
+    return f"Whisper ({os.path.basename(os.path.normpath(source.get('model', '')))})"
+
+def load_transcript_source(output_file):
+    path = source_path(output_file)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
\ No newline at end of file
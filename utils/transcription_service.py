@@ -0,0 +1,109 @@
+import logging
+import threading
+import time
+from collections import deque
+from config import SERVICE_NUM_WORKERS
+from utils.model_pool import get_model
+
+class TranscriptionService:
+    # One model instance with num_workers decoding slots shared by every job in the process.
+    # Jobs get slots in the order they asked for them, so a long job cannot starve later ones.
+    # The service holds no reference to the model itself, only the slot accounting, so the model pool can still
+    # unload it between jobs when it is least recently used or over the memory budget.
+    def __init__(self, model_path, device, compute_type, cpu_threads=0, num_workers=SERVICE_NUM_WORKERS):
+        self.model_path = model_path
+        self.device = device
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads
+        self.num_workers = num_workers
+        # Load now, so creating a service is also how the server preloads a model
+        get_model(model_path, device, compute_type, cpu_threads, num_workers)
+        self._cond = threading.Condition()
+        self._waiting = deque()
+        self._holders = {}  # thread id -> nested slot count, so a job re-decoding a window does not wait on itself
+        self._stats = {"acquisitions": 0, "wait_time": 0.0, "max_queue": 0}
+
+    @property
+    def model(self):
+        # Looked up on every job; a model the pool evicted is loaded again here
+        return get_model(self.model_path, self.device, self.compute_type, self.cpu_threads, self.num_workers)
+
+    def acquire(self):
+        thread_id = threading.get_ident()
+        with self._cond:
+            if thread_id in self._holders:
+                self._holders[thread_id] += 1
+                return
+            self._waiting.append(thread_id)
+            self._stats["max_queue"] = max(self._stats["max_queue"], len(self._waiting))
+            start_time = time.time()
+            self._cond.wait_for(lambda: self._waiting[0] == thread_id and len(self._holders) < self.num_workers)
+            self._waiting.popleft()
+            self._holders[thread_id] = 1
+            self._stats["acquisitions"] += 1
+            self._stats["wait_time"] += time.time() - start_time
+            self._cond.notify_all()
+
+    def release(self, thread_id=None):
+        thread_id = thread_id or threading.get_ident()
+        with self._cond:
+            self._holders[thread_id] -= 1
+            if not self._holders[thread_id]:
+                del self._holders[thread_id]
+            self._cond.notify_all()
+
+    def run(self, transcribe, audio, **options):
+        # Holds a slot from the call until the returned segments have been consumed
+        self.acquire()
+        try:
+            segments, info = transcribe(audio, **options)
+        except Exception:
+            self.release()
+            raise
+        return SlotSegments(segments, self, threading.get_ident()), info
+
+    def transcribe(self, audio, **options):
+        return self.run(self.model.transcribe, audio, **options)
+
+    def stats(self):
+        with self._cond:
+            stats = dict(self._stats)
+            stats["active"] = len(self._holders)
+            stats["queued"] = len(self._waiting)
+        return stats
+
+class SlotSegments:
+    def __init__(self, segments, service, thread_id):
+        self.segments = segments
+        self.service = service
+        self.thread_id = thread_id
+        self.released = False
+
+    def __iter__(self):
+        try:
+            yield from self.segments
+        finally:
+            self.close()
+
+    def close(self):
+        if not self.released:
+            self.released = True
+            self.service.release(self.thread_id)
+
+    def __del__(self):
+        self.close()
+
+_services = {}
+_services_lock = threading.Lock()
+
+def get_service(model_path, device, compute_type, cpu_threads=0):
+    key = (model_path, device, compute_type, cpu_threads)
+    with _services_lock:
+        service = _services.get(key)
+    if service is None:
+        # Model loading happens outside the lock; the pool makes concurrent callers share one load
+        service = TranscriptionService(model_path, device, compute_type, cpu_threads)
+        with _services_lock:
+            service = _services.setdefault(key, service)
+        logging.info(f"Transcription service ready for {model_path} with {service.num_workers} workers")
+    return service
\ No newline at end of file
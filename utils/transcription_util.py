@@ -1,16 +1,170 @@
-import json
-import sys
-from faster_whisper import WhisperModel
-
-def transcribe_audio(audio_file, model_path, device, output_file):
-    model = WhisperModel(model_path, device=device, compute_type="float16")
-    
-    segments, info = model.transcribe(audio_file, beam_size=5, language="en")
-    print(json.dumps({"status": f"Detected language '{info.language}' with probability {info.language_probability}"}))
-    sys.stdout.flush()
-
-    with open(output_file, 'w', encoding='utf-8') as f:
+import logging
+import time
+from faster_whisper import BatchedInferencePipeline
+from config import CPU_PROCESSES, CPU_CHUNK_SECONDS, VAD_THRESHOLD, VAD_MIN_SILENCE_MS, VAD_SPEECH_PAD_MS, REPETITION_GUARD, CHECKPOINT_INTERVAL_SECONDS, CHECKPOINT_FSYNC, TRANSCRIPT_CACHE, PCM_CACHE, DRAFT_MODEL_PATH
+from utils.audio_util import SAMPLE_RATE, load_audio
+from utils.checkpoint import settings_key, load_checkpoint, save_checkpoint, remove_checkpoint
+from utils.device_util import resolve_device
+from utils.events import print_event
+from utils.model_convert import resolve_model_path
+from utils.model_pool import model_pool
+from utils.parallel_transcribe import transcribe_parallel
+from utils.presets import get_preset
+from utils.repetition import guard_repetitions
+from utils.segment_sink import SegmentSink, ProgressThrottle
+from utils.segment_store import SegmentStore
+from utils.segment_util import shift_segments, format_segment
+from utils.transcript_cache import transcript_cache
+from utils.transcript_source import record_transcript_source
+from utils.transcription_service import get_service
+from utils.two_pass import LazyModel, default_thresholds, refine_segments
+
+def default_vad_parameters():
+    return {"threshold": VAD_THRESHOLD, "min_silence_duration_ms": VAD_MIN_SILENCE_MS, "speech_pad_ms": VAD_SPEECH_PAD_MS}
+
+def decode_options(preset=None, vad_filter=None, vad_parameters=None):
+    # Explicit vad_filter arguments override the preset
+    settings = get_preset(preset)
+    vad_filter = settings["vad_filter"] if vad_filter is None else vad_filter
+    options = {"beam_size": settings["beam_size"], "best_of": settings["best_of"], "temperature": settings["temperature"],
+               "condition_on_previous_text": settings["condition_on_previous_text"], "language": "en", "vad_filter": vad_filter}
+    if vad_filter:
+        options["vad_parameters"] = vad_parameters or default_vad_parameters()
+    return options
+
+def report_vad(info, elapsed, emit):
+    skipped = info.duration - info.duration_after_vad
+    rtf = elapsed / info.duration if info.duration else 0.0
+    # Decode time scales with the audio actually decoded, so without VAD the job would have taken about duration / duration_after_vad longer
+    speedup = info.duration / info.duration_after_vad if info.duration_after_vad else 1.0
+    logging.info(f"VAD skipped {skipped:.1f}s of {info.duration:.1f}s audio, RTF {rtf:.3f}, estimated {speedup:.2f}x faster than without VAD")
+    emit({"status": f"Voice activity detection skipped {skipped:.1f}s of {info.duration:.1f}s audio (estimated {speedup:.2f}x speedup)",
+          "vad_skipped_seconds": round(skipped, 2), "rtf": round(rtf, 4), "vad_speedup": round(speedup, 2)})
+
+def transcribe_audio(audio_file, model_path, device, output_file, compute_type="auto", cpu_threads=0, batch_size=None, num_processes=CPU_PROCESSES,
+                     vad_filter=None, vad_parameters=None, repetition_guard=REPETITION_GUARD, resume=True, use_cache=TRANSCRIPT_CACHE,
+                     draft_model_path=DRAFT_MODEL_PATH, refine_thresholds=None, preset=None, start=None, end=None, audio_start=0.0, emit=print_event):
+    # start/end select a window in absolute seconds; audio_start is where audio_file begins, non-zero when only part
+    # of the video was downloaded. Timestamps in the transcript are always absolute.
+    device, compute_type = resolve_device(device, compute_type)
+    model_path = resolve_model_path(model_path, device, compute_type)
+    options = decode_options(preset, vad_filter, vad_parameters)
+    vad_filter = options["vad_filter"]
+    # An explicit batch_size overrides the preset
+    batch_size = get_preset(preset)["batch_size"] if batch_size is None else batch_size
+    refine_thresholds = refine_thresholds or default_thresholds()
+    start_time = time.time()
+    # With the PCM cache the model gets a memory-mapped array and never decodes the file itself
+    audio = load_audio(audio_file) if PCM_CACHE else audio_file
+    # Everything besides the audio that shapes the transcript, shared by the transcript cache and checkpoints
+    settings = dict(options, batch_size=batch_size, repetition_guard=repetition_guard, draft_model_path=draft_model_path,
+                    refine_thresholds=refine_thresholds if draft_model_path else None, start=start, end=end, audio_start=audio_start)
+    checkpoint_settings = settings_key(model_path, compute_type, settings)
+
+    # A transcript of the same audio with the same settings needs no model at all
+    cache_key = None
+    if use_cache:
+        audio_hash, decoded = transcript_cache.audio_fingerprint(audio_file)
+        if decoded is not None:
+            audio = decoded
+        cache_key = transcript_cache.make_key(audio_hash, model_path, compute_type, settings)
+        cached = transcript_cache.get(cache_key)
+        if cached:
+            cached_segments, info = cached
+            with open(output_file, 'w', encoding='utf-8') as f:
+                f.writelines(format_segment(segment) for segment in cached_segments)
+            remove_checkpoint(output_file)
+            record_transcript_source(output_file, {"source": "whisper", "model": model_path, "preset": preset, "cached": True})
+            logging.info(f"Transcript cache hit for {audio_file}: {transcript_cache.stats()}")
+            emit({"status": f"Loaded {len(cached_segments)} segments from transcript cache", "progress": 99})
+            return info
+
+    # Only the requested window is decoded; offset is the absolute time of the first sample handed to the model
+    offset = audio_start
+    if start is not None or end is not None:
+        clip_start = max((start or audio_start) - audio_start, 0.0)
+        clip_end = None if end is None else int((end - audio_start) * SAMPLE_RATE)
+        audio = load_audio(audio)[int(clip_start * SAMPLE_RATE):clip_end]
+        offset += clip_start
+        emit({"status": f"Transcribing {offset:.2f}s -> {offset + len(audio) / SAMPLE_RATE:.2f}s"})
+    window_start = offset
+
+    # Pick up where an interrupted run of the same job left off
+    checkpoint = load_checkpoint(output_file, audio_file, checkpoint_settings) if resume else None
+    if checkpoint and checkpoint["offset"] <= offset:
+        checkpoint = None
+    if checkpoint:
+        audio = load_audio(audio)[int((checkpoint["offset"] - offset) * SAMPLE_RATE):]
+        offset = checkpoint["offset"]
+        emit({"status": f"Resuming transcription from {offset:.2f}s"})
+    repetition_stats = {"loops_detected": 0, "segments_discarded": 0, "redecode_seconds": 0.0, "decode_seconds_saved": 0.0}
+    two_pass_stats = {"segments_total": 0, "segments_refined": 0, "seconds_refined": 0.0}
+
+    if num_processes > 1 and device == "cpu":
+        # Parallel mode: silence-aligned chunks are transcribed by a pool of processes, each with its own model
+        emit({"status": f"Transcribing on {num_processes} CPU processes"})
+        segments, info = transcribe_parallel(audio, model_path, compute_type, num_processes, CPU_CHUNK_SECONDS, **options)
+    elif draft_model_path:
+        # Two-pass mode: the draft model does the bulk of the work, the main model is only loaded for segments it is unsure about
+        emit({"status": f"Drafting with {draft_model_path}"})
+        draft_model = get_service(draft_model_path, device, compute_type, cpu_threads)
+        segments, info = draft_model.transcribe(audio, **options)
+        if repetition_guard:
+            segments = guard_repetitions(draft_model, audio, segments, options, repetition_stats)
+        final_model = LazyModel(model_path, device, compute_type, cpu_threads)
+        segments = refine_segments(audio, segments, final_model, options, refine_thresholds, two_pass_stats)
+    else:
+        # The service shares one model between every job running in this process
+        model = get_service(model_path, device, compute_type, cpu_threads)
+        logging.info(f"Model pool stats: {model_pool.stats()}, service stats: {model.stats()}")
+
+        if batch_size:
+            # Batched mode: the pipeline splits the audio at VAD boundaries and decodes several chunks per forward pass
+            pipeline = BatchedInferencePipeline(model=model.model)
+            segments, info = model.run(pipeline.transcribe, audio, batch_size=batch_size, **options)
+        else:
+            segments, info = model.transcribe(audio, **options)
+            if repetition_guard:
+                segments = guard_repetitions(model, audio, segments, options, repetition_stats)
+    emit({"status": f"Detected language '{info.language}' with probability {info.language_probability}"})
+    if offset:
+        segments = shift_segments(segments, offset)
+    window_duration = offset + info.duration - window_start
+
+    if checkpoint:
+        # Drop anything written after the last checkpoint, it will be transcribed again
+        with open(output_file, 'r+b') as f:
+            f.truncate(checkpoint["bytes"])
+    progress = ProgressThrottle(emit)
+    with SegmentSink(output_file, 'a' if checkpoint else 'w') as sink:
+        last_checkpoint = time.time()
+        written = SegmentStore()
         for segment in segments:
-            f.write(f"[{segment.start:.2f}s -> {segment.end:.2f}s] {segment.text}\n")
-            print(json.dumps({"status": f"Transcribed segment: {segment.start:.2f}s -> {segment.end:.2f}s", "progress": min(int((segment.end / info.duration) * 100), 99)}))
-            sys.stdout.flush()
\ No newline at end of file
+            sink.write(segment)
+            written.append(segment)
+            progress({"status": f"Transcribed segment: {segment.start:.2f}s -> {segment.end:.2f}s", "progress": min(int(((segment.end - window_start) / window_duration) * 100), 99)})
+            if time.time() - last_checkpoint >= CHECKPOINT_INTERVAL_SECONDS:
+                sink.flush(fsync=CHECKPOINT_FSYNC)
+                save_checkpoint(output_file, audio_file, checkpoint_settings, segment.end, sink.bytes_written)
+                last_checkpoint = time.time()
+        sink.flush(fsync=CHECKPOINT_FSYNC)
+    progress.flush()
+    remove_checkpoint(output_file)
+    record_transcript_source(output_file, {"source": "whisper", "model": model_path, "preset": preset, "draft_model": draft_model_path})
+    # A resumed run only saw part of the audio, so it is not a complete transcript to cache
+    if cache_key and not checkpoint:
+        transcript_cache.put(cache_key, written, info)
+        logging.info(f"Transcript cache stats: {transcript_cache.stats()}")
+
+    if vad_filter:
+        report_vad(info, time.time() - start_time, emit)
+    if repetition_stats["loops_detected"]:
+        logging.info(f"Repetition guard stats: {repetition_stats}")
+        emit({"status": f"Stopped {repetition_stats['loops_detected']} repetition loop(s), saving about {repetition_stats['decode_seconds_saved']:.1f}s of decoding",
+              "repetition": repetition_stats})
+    if draft_model_path and two_pass_stats["segments_total"]:
+        refined_share = two_pass_stats["segments_refined"] / two_pass_stats["segments_total"]
+        logging.info(f"Two-pass stats: {two_pass_stats}")
+        emit({"status": f"Re-decoded {two_pass_stats['segments_refined']} of {two_pass_stats['segments_total']} draft segments ({refined_share:.0%}) with the main model",
+              "two_pass": two_pass_stats})
+    return info
\ No newline at end of file
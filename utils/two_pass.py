@@ -0,0 +1,53 @@
+import logging
+from config import TWO_PASS_MIN_AVG_LOGPROB, TWO_PASS_MAX_COMPRESSION_RATIO, TWO_PASS_MAX_NO_SPEECH_PROB
+from utils.audio_util import SAMPLE_RATE, load_audio
+from utils.transcription_service import get_service
+from utils.segment_util import shift_segments
+
+class LazyModel:
+    # Fetches the shared model on first use, so a draft that needs no refinement never loads it
+    def __init__(self, model_path, device, compute_type, cpu_threads):
+        self.args = (model_path, device, compute_type, cpu_threads)
+
+    def transcribe(self, audio, **options):
+        return get_service(*self.args).transcribe(audio, **options)
+
+def default_thresholds():
+    return {"min_avg_logprob": TWO_PASS_MIN_AVG_LOGPROB, "max_compression_ratio": TWO_PASS_MAX_COMPRESSION_RATIO,
+            "max_no_speech_prob": TWO_PASS_MAX_NO_SPEECH_PROB}
+
+def needs_refinement(segment, thresholds):
+    return (segment.avg_logprob < thresholds["min_avg_logprob"]
+            or segment.compression_ratio > thresholds["max_compression_ratio"]
+            or segment.no_speech_prob > thresholds["max_no_speech_prob"])
+
+def refine_segments(audio, draft_segments, final_model, options, thresholds, stats):
+    # Streams the draft transcript through, replacing each run of low-confidence segments with
+    # the main model's transcription of the same stretch of audio
+    audio = load_audio(audio)
+    final_options = dict(options, vad_filter=False)
+    final_options.pop("vad_parameters", None)
+    flagged = []
+
+    def refine(run):
+        start, end = run[0].start, run[-1].end
+        stats["segments_refined"] += len(run)
+        stats["seconds_refined"] += end - start
+        window = audio[int(start * SAMPLE_RATE):int(end * SAMPLE_RATE)]
+        refined, _ = final_model.transcribe(window, **final_options)
+        refined = list(shift_segments(refined, start))
+        logging.debug(f"Two-pass: re-decoded {start:.2f}s -> {end:.2f}s ({len(run)} draft segments, {len(refined)} refined)")
+        # Keep the splice inside the window so it cannot overlap the draft segment that follows
+        return [s._replace(end=min(s.end, end)) for s in refined if s.start < end]
+
+    for segment in draft_segments:
+        stats["segments_total"] += 1
+        if needs_refinement(segment, thresholds):
+            flagged.append(segment)
+            continue
+        if flagged:
+            yield from refine(flagged)
+            flagged = []
+        yield segment
+    if flagged:
+        yield from refine(flagged)
\ No newline at end of file
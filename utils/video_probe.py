@@ -0,0 +1,65 @@
+import logging
+import time
+import yt_dlp
+from config import PROBE_CACHE_FILE, PROBE_CACHE_TTL_SECONDS
+from utils.audio_cache import extract_video_id
+from utils.json_index import JsonIndex
+
+def caption_tracks(tracks):
+    # {language: [{"ext", "url", "name"}]} with only what is needed to fetch a track later
+    return {language: [{"ext": t.get("ext"), "url": t.get("url"), "name": t.get("name")} for t in formats]
+            for language, formats in (tracks or {}).items()}
+
+def summarize_info(info):
+    return {
+        "id": info["id"],
+        "title": info.get("title"),
+        "duration": info.get("duration"),
+        "is_live": info.get("is_live", False),
+        "formats": [{"format_id": f.get("format_id"), "ext": f.get("ext"), "acodec": f.get("acodec"), "abr": f.get("abr"),
+                     "filesize": f.get("filesize") or f.get("filesize_approx")}
+                    for f in info.get("formats") or [] if f.get("acodec") not in (None, "none")],
+        "chapters": [{"start": c.get("start_time"), "end": c.get("end_time"), "title": c.get("title")} for c in info.get("chapters") or []],
+        "subtitles": caption_tracks(info.get("subtitles")),
+        "automatic_captions": caption_tracks(info.get("automatic_captions")),
+    }
+
+class ProbeCache:
+    # Metadata keyed by video ID, kept in memory and persisted to one JSON file; entries older than the TTL are refetched
+    def __init__(self, cache_file=PROBE_CACHE_FILE, ttl=PROBE_CACHE_TTL_SECONDS):
+        self.cache_file = cache_file
+        self.ttl = ttl
+        # Shared with the server and job processes, see JsonIndex
+        self._index = JsonIndex(cache_file, {})
+
+    def get(self, video_id):
+        entry = self._index.read().get(video_id)
+        if entry is None or time.time() - entry["probed_at"] > self.ttl:
+            return None
+        return entry
+
+    def put(self, metadata):
+        with self._index.update() as entries:
+            entries[metadata["id"]] = dict(metadata, probed_at=time.time())
+            # Expired entries are only dropped when writing, so the file does not grow forever
+            now = time.time()
+            for video_id in [k for k, e in entries.items() if now - e["probed_at"] > self.ttl]:
+                del entries[video_id]
+            return entries.get(metadata["id"])
+
+probe_cache = ProbeCache()
+
+def probe_video(url, use_cache=True):
+    # Title, duration, audio formats, chapters and caption tracks without downloading any media
+    video_id = extract_video_id(url)
+    if use_cache and video_id:
+        cached = probe_cache.get(video_id)
+        if cached:
+            logging.info(f"Probe cache hit for {video_id}")
+            return cached
+    start_time = time.time()
+    with yt_dlp.YoutubeDL({'quiet': True, 'skip_download': True}) as ydl:
+        info = ydl.extract_info(url, download=False)
+    logging.info(f"Probed {info['id']} in {time.time() - start_time:.2f} seconds")
+    metadata = summarize_info(info)
+    return probe_cache.put(metadata) if use_cache else metadata
\ No newline at end of file
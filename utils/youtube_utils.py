@@ -1,7 +1,12 @@
 import os
 import re
+import shutil
 import yt_dlp
-import glob
+from yt_dlp.utils import download_range_func
+from config import AUDIO_CACHE
+from utils.audio_cache import audio_cache, extract_video_id
+from utils.job_dir import job_directory
+from utils.video_probe import probe_video
 
 def sanitize_filename(filename):
     # Remove invalid characters
@@ -10,18 +15,58 @@ def sanitize_filename(filename):
     sanitized = sanitized.replace(' ', '_')
     return sanitized
 
-def download_or_use_existing_audio(url):
-    ydl_opts = {
+def parse_time(value):
+    # Accepts seconds ("95"), "mm:ss" or "hh:mm:ss"; empty values mean no limit
+    if value is None or str(value).strip() == "":
+        return None
+    seconds = 0.0
+    for part in str(value).strip().split(":"):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+def range_suffix(start, end):
+    if start is None and end is None:
+        return ""
+    return f"_{int(start or 0)}-{'end' if end is None else int(end)}"
+
+def cached_video_info(url):
+    # Title and duration of a video whose whole audio is cached, found from the URL alone; None otherwise
+    video_id = extract_video_id(url)
+    cached = audio_cache.peek(video_id) if AUDIO_CACHE and video_id else None
+    if cached and cached["title"] and cached["duration"]:
+        return cached["title"], cached["duration"]
+    return None
+
+def get_video_info(url):
+    # Title and duration without downloading anything. A cached download needs no network call at all, even after
+    # the probe cache has expired; otherwise the metadata comes from the probe cache or a metadata-only probe.
+    cached = cached_video_info(url)
+    if cached:
+        return sanitize_filename(cached[0]), cached[1]
+    metadata = probe_video(url)
+    return sanitize_filename(metadata['title']), metadata['duration']
+
+def download_or_use_existing_audio(url, start=None, end=None):
+    # With start/end only that part of the stream is fetched (ffmpeg seeks with HTTP range requests),
+    # so the returned file begins at `start` seconds into the video
+    suffix = range_suffix(start, end)
+    # A cached download is found from the video ID in the URL, without asking YouTube for anything
+    video_id = extract_video_id(url)
+    if AUDIO_CACHE and video_id:
+        cached = audio_cache.get(f"{video_id}{suffix}")
+        if cached:
+            print(f"Using cached audio file: {cached['path']}")
+            return cached['path'], f"{sanitize_filename(cached['title'])}{suffix}"
+
+    # The native audio stream (usually opus in webm, or m4a) is kept as-is. Re-encoding it to MP3 cost CPU time and
+    # quality, and the decoder resamples whatever container it gets to 16 kHz mono anyway.
+    # yt-dlp writes into a scratch directory of its own and the finished file is moved out of it, so parallel
+    # downloads never pick up or rename each other's files
+    with job_directory("download-") as scratch_dir, yt_dlp.YoutubeDL({
         'format': 'bestaudio/best',
-        'postprocessors': [{
-            'key': 'FFmpegExtractAudio',
-            'preferredcodec': 'mp3',
-            'preferredquality': '192',
-        }],
-        'outtmpl': '%(title)s.%(ext)s',
-    }
-
-    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        'outtmpl': os.path.join(scratch_dir, '%(id)s.%(ext)s'),
+        'download_ranges': download_range_func(None, [(start or 0, float('inf') if end is None else end)]) if suffix else None,
+    }) as ydl:
         try:
             print("Starting download process...")
             info = ydl.extract_info(url, download=True)
@@ -30,28 +75,30 @@ def download_or_use_existing_audio(url):
             print(f"Video title: {video_title}")
             print(f"Sanitized title: {safe_title}")
 
-            print("Searching for downloaded file...")
-            mp3_files = glob.glob("*.mp3")
-            print(f"MP3 files found: {mp3_files}")
-
-            if not mp3_files:
-                raise FileNotFoundError(f"Could not find any MP3 files after download.")
+            # yt-dlp reports where it wrote the file, so there is no need to search the directory for it
+            downloaded_file = info['requested_downloads'][0]['filepath']
+            print(f"Downloaded file: {downloaded_file}")
 
-            # Use the first MP3 file found
-            downloaded_file = mp3_files[0]
-            print(f"Using file: {downloaded_file}")
+            # Cached files are named after the video ID, so two videos with the same title never collide
+            if AUDIO_CACHE:
+                duration = info.get('duration')
+                if duration and suffix:
+                    duration = min(end or duration, duration) - (start or 0)
+                entry = audio_cache.put(f"{info['id']}{suffix}", downloaded_file, video_title, duration)
+                print(f"Final audio file: {entry['path']}")
+                return entry['path'], f"{safe_title}{suffix}"
 
-            # Rename the file if it's not already in the desired format
-            audio_file = f"{safe_title}.mp3"
-            if downloaded_file != audio_file:
-                os.rename(downloaded_file, audio_file)
-                print(f"Renamed {downloaded_file} to {audio_file}")
+            # Without the cache the file ends up in the working directory, named after the video
+            extension = os.path.splitext(downloaded_file)[1]
+            audio_file = f"{safe_title}{suffix}{extension}"
+            shutil.move(downloaded_file, audio_file)
+            print(f"Moved {downloaded_file} to {audio_file}")
 
             if not os.path.exists(audio_file):
                 raise FileNotFoundError(f"Could not find or create audio file: {audio_file}")
 
             print(f"Final audio file: {audio_file}")
-            return audio_file, safe_title
+            return audio_file, f"{safe_title}{suffix}"
 
         except Exception as e:
             print(f"Error in download_or_use_existing_audio: {str(e)}")
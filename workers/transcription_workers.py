@@ -4,7 +4,9 @@ import sys
 import threading
 import time
 from PyQt6.QtCore import QObject, pyqtSignal
-from utils.youtube_utils import download_or_use_existing_audio
+from utils.youtube_utils import download_or_use_existing_audio, get_video_info, range_suffix
+from utils.streaming import transcribe_stream
+from utils.captions import transcribe_from_captions
 from utils.transcription_util import transcribe_audio
 from utils.claude_utils import process_with_claude, read_transcript
 
@@ -16,12 +18,15 @@ class WorkerSignals(QObject):
     error = pyqtSignal(str)
 
 class Worker(threading.Thread):
-    def __init__(self, url, model_path, device, api_key):
+    def __init__(self, url, model_path, device, api_key, stream=False, start=None, end=None):
         super().__init__()
         self.url = url
         self.model_path = model_path
         self.device = device
         self.api_key = api_key
+        self.stream = stream
+        self.start = start
+        self.end = end
         self.signals = WorkerSignals()
 
     def run(self):
@@ -29,9 +34,11 @@ class Worker(threading.Thread):
             self.log_and_print("Worker: Starting process...")
             self.signals.progress_update.emit(0)
 
-            self.log_and_print("Worker: Downloading or locating audio file...")
-            audio_file, video_title = download_or_use_existing_audio(self.url, self.signals)
-            self.log_and_print(f"Worker: Using audio file: {audio_file}")
+            # A metadata-only probe is cheap and cached, so the video length is known before any bandwidth is spent
+            self.log_and_print("Worker: Fetching video metadata...")
+            video_title, duration = get_video_info(self.url)
+            video_title += range_suffix(self.start, self.end)
+            self.log_and_print(f"Worker: Video: {video_title} ({duration or 0:.0f} seconds)")
 
             self.output_file = os.path.abspath(f"{video_title}.txt")
             self.markdown_file = os.path.abspath(f"{video_title}_analysis.md")
@@ -40,8 +47,21 @@ class Worker(threading.Thread):
                 f.write(f"Transcript for: {video_title}\n\n")
             self.log_and_print(f"Worker: Created output file: {self.output_file}")
 
-            self.log_and_print("Worker: Starting transcription process...")
-            transcribe_audio(audio_file, self.model_path, self.device, self.signals, self.output_file)
+            # Existing captions make the download and the model unnecessary
+            source = transcribe_from_captions(self.url, self.output_file, start=self.start, end=self.end, emit=self.emit_event)
+            if source:
+                self.log_and_print(f"Worker: Transcript taken from {source['kind']} {source['language']} captions")
+            elif self.stream:
+                # The audio is piped straight into the decoder
+                self.log_and_print("Worker: Starting transcription process...")
+                transcribe_stream(self.url, self.model_path, self.device, self.output_file, duration, start=self.start, end=self.end, emit=self.emit_event)
+            else:
+                self.log_and_print("Worker: Downloading or locating audio file...")
+                audio_file, video_title = download_or_use_existing_audio(self.url, self.start, self.end)
+                self.log_and_print(f"Worker: Using audio file: {audio_file}")
+                self.log_and_print("Worker: Starting transcription process...")
+                # The downloaded file already begins at self.start, so only the absolute offset needs passing on
+                transcribe_audio(audio_file, self.model_path, self.device, self.output_file, audio_start=self.start or 0.0, emit=self.emit_event)
             self.log_and_print("Worker: Transcription process completed.")
 
             self.log_and_print("Worker: Waiting for 5 seconds...")
@@ -84,6 +104,12 @@ class Worker(threading.Thread):
 
         sys.stdout.flush()  # Ensure all print statements are flushed to console
 
+    def emit_event(self, event):
+        # transcribe_audio already rate-limits progress events, so this is at most a few signals per second
+        if 'progress' in event:
+            self.signals.progress_update.emit(event['progress'])
+        self.signals.log.emit(event.get('message', event['status']))
+
     def log_and_print(self, message):
         print(message, flush=True)
         self.signals.log.emit(message)
\ No newline at end of file
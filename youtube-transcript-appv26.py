@@ -5,11 +5,19 @@ import traceback
 import anthropic
 import time
 
-from PyQt6.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QTextEdit, QProgressBar, QComboBox, QLabel, QFileDialog
+from PyQt6.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QTextEdit, QProgressBar, QComboBox, QLabel, QFileDialog, QCheckBox
 from PyQt6.QtCore import QThreadPool, QRunnable, pyqtSignal, QObject
 
 from pytubefix import YouTube
-from faster_whisper import WhisperModel
+from utils.device_util import resolve_device
+from utils.transcription_service import get_service
+from utils.streaming import transcribe_stream
+from utils.audio_cache import audio_cache
+from utils.job_dir import job_directory
+from utils.video_probe import probe_video
+from utils.youtube_utils import cached_video_info
+from utils.captions import transcribe_from_captions
+from utils.transcript_source import record_transcript_source
 
 # Set up logging
 logging.basicConfig(filename='app.log', level=logging.DEBUG, 
@@ -89,12 +97,13 @@ class WorkerSignals(QObject):
     error = pyqtSignal(str)
 
 class Worker(QRunnable):
-    def __init__(self, url, model_path, device, api_key):
+    def __init__(self, url, model_path, device, api_key, stream=False):
         super().__init__()
         self.url = url
         self.model_path = model_path
         self.device = device
         self.api_key = api_key
+        self.stream = stream
         self.signals = WorkerSignals()
         self.total_duration = 0
         self.processed_duration = 0
@@ -104,10 +113,7 @@ class Worker(QRunnable):
             self.signals.log.emit("Starting process...")
             self.signals.progress_update.emit(0)
 
-            self.signals.log.emit("Downloading or locating audio file...")
-            audio_file, video_title = self.download_or_use_existing_audio()
-            self.signals.log.emit(f"Using audio file: {audio_file}")
-
+            video_title = self.fetch_video_info()
             self.output_file = os.path.abspath(f"{video_title}.txt")
             self.markdown_file = os.path.abspath(f"{video_title}_analysis.md")
 
@@ -116,8 +122,20 @@ class Worker(QRunnable):
                 f.write(f"Transcript for: {video_title}\n\n")
             self.signals.log.emit(f"Created output file: {self.output_file}")
 
-            self.signals.log.emit("Starting transcription process...")
-            self.transcribe_audio(audio_file)
+            # Existing captions make the download and the model unnecessary
+            source = transcribe_from_captions(self.url, self.output_file, mode='a', emit=self.emit_event)
+            if source:
+                self.signals.log.emit(f"Transcript taken from {source['kind']} {source['language']} captions")
+            elif self.stream:
+                self.signals.log.emit("Starting transcription process...")
+                # Transcription starts on the first block while the rest of the audio is still downloading
+                transcribe_stream(self.url, self.model_path, self.device, self.output_file, self.total_duration, mode='a', emit=self.emit_event)
+            else:
+                self.signals.log.emit("Downloading or locating audio file...")
+                audio_file, _ = self.download_or_use_existing_audio()
+                self.signals.log.emit(f"Using audio file: {audio_file}")
+                self.signals.log.emit("Starting transcription process...")
+                self.transcribe_audio(audio_file)
             self.signals.log.emit("Transcription completed")
 
             self.signals.log.emit("Preparing to send transcript to Claude API for analysis...")
@@ -140,36 +158,52 @@ class Worker(QRunnable):
         finally:
             self.signals.finished.emit()
 
+    def fetch_video_info(self):
+        # A cached download already knows the title and duration, so only uncached videos are probed
+        title, self.total_duration = cached_video_info(self.url) or (None, None)
+        if title is None:
+            metadata = probe_video(self.url)
+            title, self.total_duration = metadata["title"], metadata["duration"]
+        safe_title = "".join([c for c in title if c.isalpha() or c.isdigit() or c==' ']).rstrip()
+        self.signals.log.emit(f"Video: {safe_title} ({self.total_duration} seconds)")
+        return safe_title
+
+    def emit_event(self, event):
+        if 'progress' in event:
+            self.signals.progress_update.emit(event['progress'])
+        self.signals.log.emit(event.get('message', event['status']))
+
     def download_or_use_existing_audio(self):
         try:
             self.signals.log.emit(f"Processing video from URL: {self.url}")
             video = YouTube(self.url)
-            video_title = video.title
+            # The video ID comes from the URL, so a cached file is found without any network request
+            cached = audio_cache.get(video.video_id)
+            if cached:
+                safe_title = "".join([c for c in cached["title"] if c.isalpha() or c.isdigit() or c==' ']).rstrip()
+                self.total_duration = cached["duration"]
+                self.signals.log.emit(f"Using cached audio file: {cached['path']}")
+                return cached["path"], safe_title
+
+            # Title and duration come from a metadata-only probe, cached for repeat requests
+            metadata = probe_video(self.url)
+            video_title = metadata["title"]
             safe_title = "".join([c for c in video_title if c.isalpha() or c.isdigit() or c==' ']).rstrip()
-            self.total_duration = video.length
+            self.total_duration = metadata["duration"]
             self.signals.log.emit(f"Video title: {safe_title}")
             self.signals.log.emit(f"Video duration: {self.total_duration} seconds")
 
-            mp4_file = f"{safe_title}.mp4"
-            mp3_file = f"{safe_title}.mp3"
-
-            if os.path.exists(mp3_file):
-                self.signals.log.emit(f"Using existing MP3 file: {mp3_file}")
-                return mp3_file, safe_title
-            elif os.path.exists(mp4_file):
-                self.signals.log.emit(f"Using existing MP4 file: {mp4_file}")
-                return mp4_file, safe_title
-            else:
-                self.signals.log.emit("Downloading audio...")
-                audio = video.streams.filter(only_audio=True).first()
-                if audio is None:
-                    raise ValueError("No audio stream found for this video.")
-                output = audio.download(output_path=".", filename=safe_title)
-                base, _ = os.path.splitext(output)
-                new_file = f"{base}.mp3"
-                os.rename(output, new_file)
-                self.signals.log.emit(f"Audio download completed: {new_file}")
-                return new_file, safe_title
+            # Audio is kept in the container YouTube serves it in and cached under the video ID, not the title
+            self.signals.log.emit("Downloading audio...")
+            audio = video.streams.get_audio_only()
+            if audio is None:
+                raise ValueError("No audio stream found for this video.")
+            # Downloaded in a private scratch directory and moved into the cache once complete
+            with job_directory("download-") as scratch_dir:
+                downloaded_file = audio.download(output_path=scratch_dir, filename=f"{video.video_id}.{audio.subtype}")
+                new_file = audio_cache.put(video.video_id, downloaded_file, video_title, self.total_duration)["path"]
+            self.signals.log.emit(f"Audio download completed: {new_file}")
+            return new_file, safe_title
         except Exception as e:
             self.signals.log.emit(f"Error in download_or_use_existing_audio: {str(e)}")
             logging.exception("Error in download_or_use_existing_audio")
@@ -178,7 +212,9 @@ class Worker(QRunnable):
     def transcribe_audio(self, audio_file):
         try:
             self.signals.log.emit(f"Starting transcription using model: {self.model_path}")
-            model = WhisperModel(self.model_path, device=self.device, compute_type="float16")
+            device, compute_type = resolve_device(self.device)
+            # Workers running at the same time in the thread pool share one model
+            model = get_service(self.model_path, device, compute_type)
             
             self.signals.log.emit("Model loaded, beginning transcription")
             segments, info = model.transcribe(audio_file, beam_size=5, language="en")
@@ -193,6 +229,7 @@ class Worker(QRunnable):
                     self.signals.progress_update.emit(progress)
                     self.signals.log.emit(f"Transcribed and wrote segment: {segment.start:.2f}s -> {segment.end:.2f}s")
             
+            record_transcript_source(self.output_file, {"source": "whisper", "model": self.model_path})
             self.signals.log.emit("Transcription process completed.")
         except Exception as e:
             self.signals.log.emit(f"Error in transcribe_audio: {str(e)}")
@@ -230,8 +267,10 @@ class MainWindow(QMainWindow):
         device_layout = QHBoxLayout()
         device_layout.addWidget(QLabel("Device:"))
         self.device_combo = QComboBox()
-        self.device_combo.addItems(["cuda", "cpu"])
+        self.device_combo.addItems(["auto", "cuda", "cpu"])
         device_layout.addWidget(self.device_combo)
+        self.stream_checkbox = QCheckBox("Stream while downloading")
+        device_layout.addWidget(self.stream_checkbox)
         layout.addLayout(device_layout)
 
         # API Key input
@@ -288,7 +327,7 @@ class MainWindow(QMainWindow):
         self.progress_bar.setValue(0)
         self.log_text.clear()
 
-        worker = Worker(url, model_path, self.device_combo.currentText(), api_key)
+        worker = Worker(url, model_path, self.device_combo.currentText(), api_key, self.stream_checkbox.isChecked())
         worker.signals.log.connect(self.log)
         worker.signals.progress_update.connect(self.update_progress)
         worker.signals.finished.connect(self.process_finished)